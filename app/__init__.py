@@ -1,22 +1,65 @@
 def create_app():
+    import time
+
+    started = time.perf_counter()
+    timings = []
+
+    def phase_done(name):
+        # Time spent since the previous phase, imports included
+        nonlocal started
+        now = time.perf_counter()
+        timings.append((name, (now - started) * 1000))
+        started = now
+
     from flask import Flask
 
     from config import Config
 
-    from . import models
-    from .controllers.blueprints import api, views
-    from .extensions import bcrypt, db, ma, migrate
-
     app = Flask(__name__, static_folder="static", template_folder="templates")
     app.config.from_object(Config)
 
-    bcrypt.init_app(app)
+    if Config.TRUSTED_PROXIES > 0:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+
+        # The rate limits are keyed by the client address, which the proxies pass in their headers
+        app.wsgi_app = ProxyFix(
+            app.wsgi_app, x_for=Config.TRUSTED_PROXIES, x_proto=Config.TRUSTED_PROXIES
+        )
+
+    from . import json_provider
+
+    json_provider.init_app(app)
+    phase_done("flask")
+
+    from . import database, models
+    from .extensions import db
+
+    database.init_app(app)
     db.init_app(app)
-    ma.init_app(app)
-    migrate.init_app(app, db)
+    phase_done("database")
+
+    from .controllers.blueprints import api, views
 
     app.register_blueprint(api)
     app.register_blueprint(views)
     app.url_map.strict_slashes = False
+    phase_done("blueprints")
+
+    from .services import asset_service
+
+    asset_service.init_app(app)
+    phase_done("assets")
+
+    from . import commands
+
+    commands.init_app(app)
+    phase_done("commands")
+
+    if Config.SESSION_SWEEP_INTERVAL_SECS > 0:
+        from .services import sweeper_service
+
+        sweeper_service.start_sweeper(app)
+        phase_done("sweeper")
 
+    app.extensions["startup_timings"] = timings
     return app
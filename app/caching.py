@@ -0,0 +1,175 @@
+"""
+In-process caching primitives shared by the services. These caches live in the memory of a single
+worker process and are safe to use from multiple threads.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Bounded cache with least-recently-used eviction where every entry carries its own expiration
+    timestamp. Expired entries are dropped lazily when they are looked up or evicted by newer
+    entries. A cache with a max size of 0 is disabled and never stores anything.
+
+    :ivar max_size: The maximum number of entries kept in the cache.
+    :ivar hits: The number of lookups that returned a cached value.
+    :ivar misses: The number of lookups that found no valid entry.
+    """
+
+    def __init__(self, max_size, clock=time.time):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Retrieve the value stored under the given key if it exists and has not expired.
+
+        :param key: The key to look up.
+        :param default: The value returned when there is no valid entry for the key.
+        :return: The cached value, or the default value.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                expires_at, value = entry
+                if self._clock() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            self.misses += 1
+            return default
+
+    def set(self, key, value, expires_at):
+        """
+        Store a value under the given key until the given expiration timestamp. If the cache is
+        full, the least recently used entry is evicted.
+
+        :param key: The key under which the value is stored.
+        :param value: The value to store.
+        :param expires_at: The Unix timestamp after which the entry is no longer valid.
+        :return: None
+        """
+
+        if self.max_size <= 0 or expires_at <= self._clock():
+            return
+
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """
+        Remove the entry stored under the given key, if any.
+
+        :param key: The key to remove.
+        :return: None
+        """
+
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Remove every entry from the cache and reset the hit and miss counters.
+
+        :return: None
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Return a snapshot of the cache counters.
+
+        :return: A dictionary with the current size, max size, hits and misses.
+        """
+
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls that share the same key. The first caller runs the function
+    while the other callers with the same key wait for it to finish and receive the same result,
+    or the same exception.
+    """
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """
+        Run the given function once for all concurrent callers that use the same key.
+
+        :param key: The key that identifies the call.
+        :param fn: A function without arguments that computes the result.
+        :return: The result returned by the function.
+        :raises Exception: Any exception raised by the function.
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+
+            if leader:
+                call = self._calls[key] = SingleFlight._Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self):
+        """
+        Return the number of keys that currently have a call in progress.
+
+        :return: The number of calls in progress.
+        """
+
+        with self._lock:
+            return len(self._calls)
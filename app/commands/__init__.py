@@ -0,0 +1,56 @@
+"""
+Command line commands of the application. They are registered on the Flask CLI, so they are
+available through `flask <command>`.
+"""
+
+import click
+
+
+def init_migrations(app):
+    """
+    Register Flask-Migrate and its `flask db` commands. Alembic takes a long time to import and is
+    only needed to manage migrations, so it is only loaded when the application is created by the
+    Flask CLI, or when this function is called.
+
+    :param app: The Flask application.
+    :return: None
+    """
+
+    from flask_migrate import Migrate
+
+    from app.extensions import db
+
+    Migrate(app, db)
+
+
+def init_app(app):
+    """
+    Register the commands of the application and Flask-Migrate. The command modules import services
+    that requests never use, such as the import, export and schema audit services, so they are only
+    loaded when the application is created by the Flask CLI.
+
+    :param app: The Flask application.
+    :return: None
+    """
+
+    # The Flask CLI creates the application inside a click context, a WSGI server does not
+    if click.get_current_context(silent=True) is None:
+        return
+
+    from .asset_commands import assets
+    from .db_commands import db_audit
+    from .password_commands import calibrate_hash
+    from .rate_limit_commands import rate_limits
+    from .session_commands import sessions
+    from .startup_commands import startup_profile
+    from .user_commands import users
+
+    app.cli.add_command(assets)
+    app.cli.add_command(db_audit)
+    app.cli.add_command(calibrate_hash)
+    app.cli.add_command(rate_limits)
+    app.cli.add_command(sessions)
+    app.cli.add_command(startup_profile)
+    app.cli.add_command(users)
+
+    init_migrations(app)
@@ -0,0 +1,113 @@
+"""
+Commands for building the static assets before a deploy.
+"""
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app.services import asset_service
+
+assets = AppGroup("assets", help="Build the static assets.")
+
+
+def _format_size(size):
+    return f"{size / 1024:,.0f} KiB"
+
+
+@assets.command("build")
+@click.option(
+    "--widths",
+    default=",".join(map(str, asset_service.IMAGE_WIDTHS)),
+    show_default=True,
+    help="Comma-separated widths of the image variants, in pixels.",
+)
+@click.option(
+    "--format",
+    "formats",
+    type=click.Choice(list(asset_service.FORMATS)),
+    multiple=True,
+    help="Format of the image variants. Can be repeated. Defaults to every format Pillow supports.",
+)
+def build(widths, formats):
+    """
+    Build resized WebP and AVIF variants of the images under static/images, then copy every static
+    file to a name that contains a hash of its content, with gzip and brotli versions of the text
+    files, and write the manifests used to serve them. The images require Pillow, and are skipped
+    without it unless --format is given. The brotli versions require the brotli package.
+    """
+
+    try:
+        widths = sorted({int(width) for width in widths.split(",")})
+    except ValueError:
+        raise click.BadParameter("The widths must be integers.", param_hint="--widths")
+
+    if not widths or widths[0] < 1:
+        raise click.BadParameter("The widths must be positive.", param_hint="--widths")
+
+    def report(result):
+        sizes = ", ".join(
+            f"{image_format} {_format_size(result.widest_bytes(image_format))}"
+            for image_format in result.variants
+        )
+        click.echo(f"{result.source}: {_format_size(result.original_bytes)} -> {sizes}")
+
+    try:
+        results = asset_service.build_images(
+            current_app.static_folder, widths, list(formats), on_image=report
+        )
+    except RuntimeError as e:
+        if formats:
+            raise click.ClickException(str(e))
+        click.echo(f"Skipping the images: {e}", err=True)
+        results = None
+
+    if results:
+        _report_images(results)
+    elif results is not None:
+        click.echo("No images found.")
+
+    click.echo()
+    _report_static(
+        asset_service.build_static(current_app.static_folder, current_app.static_url_path)
+    )
+
+
+def _report_images(results):
+    # The savings compare each original with the widest variant in the smallest format, which
+    # is the largest file a browser that supports that format downloads instead
+    original = sum(result.original_bytes for result in results)
+    built = sum(
+        min(result.widest_bytes(image_format) for image_format in result.variants)
+        for result in results
+    )
+
+    click.echo()
+    click.echo(
+        f"{len(results)} images: {_format_size(original)} -> {_format_size(built)} at full width, "
+        f"{_format_size(original - built)} saved ({(original - built) / original:.0%})."
+    )
+
+
+def _report_static(results):
+    compressed = [result for result in results if result.encoded_bytes]
+    click.echo(f"{len(results)} static files fingerprinted, {len(compressed)} compressed.")
+
+    if not compressed:
+        return
+
+    original = sum(result.original_bytes for result in compressed)
+    for encoding in asset_service.ENCODINGS:
+        # The brotli versions are only built when the brotli package is installed
+        if not any(encoding in result.encoded_bytes for result in compressed):
+            click.echo(f"{encoding}: not built.")
+            continue
+
+        # Files that do not shrink with an encoding are sent as they are
+        encoded = sum(
+            result.encoded_bytes.get(encoding, result.original_bytes) for result in compressed
+        )
+        click.echo(
+            f"{encoding}: {_format_size(original)} -> {_format_size(encoded)} "
+            f"({(original - encoded) / original:.0%} saved)."
+        )
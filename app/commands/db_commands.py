@@ -0,0 +1,28 @@
+"""
+Commands for inspecting the database schema.
+"""
+
+import click
+from flask.cli import with_appcontext
+
+from app.services import schema_audit_service
+
+
+@click.command("db-audit")
+@with_appcontext
+def db_audit():
+    """
+    Report duplicate, redundant, missing and unused indexes, and foreign keys without an index,
+    by comparing the models with the live database schema.
+    """
+
+    findings = schema_audit_service.audit_schema()
+
+    if not findings:
+        click.echo("No index problems found.")
+        return
+
+    for finding in findings:
+        click.echo(f"[{finding.kind}] {finding.table}: {finding.message}")
+
+    raise SystemExit(1)
@@ -0,0 +1,106 @@
+"""
+The export command shared by the users and sessions command groups.
+"""
+
+import os
+import sys
+import tempfile
+from datetime import timezone
+
+import click
+
+from app.services import export_service
+
+
+def _export_to_file(output, run):
+    """
+    Export to a temporary file next to the output and move it over the output once the export
+    succeeds, so that an existing file is left untouched when the export fails.
+    """
+
+    directory, name = os.path.split(os.path.abspath(output))
+    file = tempfile.NamedTemporaryFile(
+        "wb", dir=directory, prefix=f".{name}.", suffix=".tmp", delete=False
+    )
+
+    try:
+        with file:
+            count = run(file)
+        os.replace(file.name, output)
+    except BaseException:
+        os.unlink(file.name)
+        raise
+
+    return count
+
+
+def add_export_command(group, export, noun, active_help):
+    """
+    Add an `export` command to a command group.
+
+    :param group: The command group.
+    :param export: The export function of export_service to call.
+    :param noun: The plural name of the exported rows, used in the messages.
+    :param active_help: The help of the --active-only option.
+    :return: The command.
+    """
+
+    @group.command(
+        "export",
+        help=f"Stream {noun} to OUTPUT as CSV or JSON Lines, optionally compressed with gzip. "
+        "Use - or omit OUTPUT to write to the standard output.",
+    )
+    @click.argument("output", default="-")
+    @click.option(
+        "--format",
+        "file_format",
+        type=click.Choice(export_service.FORMATS),
+        default=None,
+        help="Format of the output. Detected from its extension by default, or csv for stdout.",
+    )
+    @click.option("--gzip", "compress", is_flag=True, default=None, help="Compress with gzip.")
+    @click.option(
+        "--created-after",
+        type=click.DateTime(),
+        default=None,
+        help="Only export rows created after this date and time, in UTC.",
+    )
+    @click.option("--active-only", is_flag=True, help=active_help)
+    @click.option(
+        "--batch-size",
+        type=click.IntRange(min=1),
+        default=1000,
+        show_default=True,
+        help="Number of rows fetched from the database at a time.",
+    )
+    def export_command(output, file_format, compress, created_after, active_only, batch_size):
+        detected_format, detected_compress = "csv", False
+
+        if output != "-":
+            try:
+                detected_format, detected_compress = export_service.detect_format(output)
+            except ValueError as e:
+                if file_format is None:
+                    raise click.UsageError(str(e))
+
+        if created_after is not None and created_after.tzinfo is None:
+            created_after = created_after.replace(tzinfo=timezone.utc)
+
+        def run(stream):
+            return export(
+                stream,
+                file_format or detected_format,
+                detected_compress if compress is None else compress,
+                created_after,
+                active_only,
+                batch_size,
+            )
+
+        try:
+            count = run(sys.stdout.buffer) if output == "-" else _export_to_file(output, run)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+
+        click.echo(f"{count} {noun} exported.", err=True)
+
+    return export_command
@@ -0,0 +1,71 @@
+"""
+Commands for tuning password hashing.
+"""
+
+import click
+
+from app.services import password_hashers
+from config import Config
+
+
+@click.command("calibrate-hash")
+@click.option(
+    "--algorithm",
+    type=click.Choice(sorted(password_hashers.HASHERS)),
+    default=None,
+    help="Hasher to calibrate. Defaults to PASSWORD_HASHER.",
+)
+@click.option(
+    "--target-ms",
+    type=click.FloatRange(min=1),
+    default=250.0,
+    show_default=True,
+    help="Target time of one hash, in milliseconds.",
+)
+@click.option(
+    "--memory-cost",
+    type=click.IntRange(min=8),
+    default=None,
+    help="argon2id memory cost in KiB. Defaults to ARGON2_MEMORY_COST.",
+)
+@click.option(
+    "--parallelism",
+    type=click.IntRange(min=1),
+    default=None,
+    help="argon2id parallelism. Defaults to ARGON2_PARALLELISM.",
+)
+def calibrate_hash(algorithm, target_ms, memory_cost, parallelism):
+    """
+    Measure the password hasher on this machine and print the settings that bring the time of one
+    hash as close as possible to the target without exceeding it.
+    """
+
+    algorithm = algorithm or Config.PASSWORD_HASHER
+    fixed_params = {}
+
+    if algorithm == "argon2id":
+        fixed_params = {
+            "memory_cost": memory_cost or Config.ARGON2_MEMORY_COST,
+            "parallelism": parallelism or Config.ARGON2_PARALLELISM,
+        }
+
+    try:
+        chosen, measurements = password_hashers.calibrate(
+            algorithm, target_ms / 1000, **fixed_params
+        )
+    except (RuntimeError, ValueError) as e:
+        raise click.ClickException(str(e))
+
+    for params, elapsed in measurements:
+        described = ", ".join(f"{name}={value}" for name, value in params.items())
+        click.echo(f"{described}: {elapsed * 1000:.1f} ms")
+
+    click.echo()
+    click.echo(f"PASSWORD_HASHER={algorithm}")
+
+    if algorithm == "bcrypt":
+        click.echo(f"BCRYPT_LOG_ROUNDS={chosen['rounds']}")
+    else:
+        click.echo(f"ARGON2_MEMORY_COST={chosen['memory_cost']}")
+        click.echo(f"ARGON2_TIME_COST={chosen['time_cost']}")
+        click.echo(f"ARGON2_PARALLELISM={chosen['parallelism']}")
@@ -0,0 +1,28 @@
+"""
+Commands for managing the login and registration rate limits.
+"""
+
+import click
+from flask.cli import AppGroup
+
+from app.stores import parse_address
+from config import Config
+
+rate_limits = AppGroup("rate-limits", help="Manage the login and registration rate limits.")
+
+
+@rate_limits.command("serve-store")
+@click.option(
+    "--address",
+    default=lambda: Config.RATE_LIMIT_STORE_ADDRESS or "127.0.0.1:50001",
+    help="The host:port address to listen on.",
+)
+def serve_store(address):
+    """
+    Serve the rate limit counters shared by the workers configured with RATE_LIMIT_STORE_ADDRESS.
+    """
+
+    from app.stores.rate_limit_store import serve_rate_limit_state
+
+    click.echo(f"Serving the rate limit store at {address}.")
+    serve_rate_limit_state(parse_address(address), Config.RATE_LIMIT_STORE_AUTHKEY.encode())
@@ -0,0 +1,73 @@
+"""
+Commands for managing user sessions, such as removing expired sessions, exporting them and serving
+the shared in-memory session store.
+"""
+
+import click
+from flask.cli import AppGroup
+
+from app.services import export_service, sweeper_service
+from app.stores import parse_address
+from config import Config
+
+from .export_commands import add_export_command
+
+sessions = AppGroup("sessions", help="Manage user sessions.")
+
+add_export_command(
+    sessions,
+    export_service.export_sessions,
+    "sessions",
+    "Only export sessions that have not expired.",
+)
+
+
+@sessions.command("sweep")
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Maximum number of sessions deleted per batch.",
+)
+@click.option(
+    "--rate",
+    type=click.FloatRange(min=0),
+    default=None,
+    help="Maximum number of batches per second (0 for no limit).",
+)
+@click.option(
+    "--max-batches",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Stop after this number of batches.",
+)
+def sweep(batch_size, rate, max_batches):
+    """
+    Delete expired sessions in bounded batches and report the progress of each batch.
+    """
+
+    def report(batch, deleted, total):
+        click.echo(f"Batch {batch}: {deleted} sessions deleted ({total} in total).")
+
+    total = sweeper_service.sweep_expired_sessions(
+        batch_size, rate, max_batches, on_progress=report
+    )
+    click.echo(f"Done. {total} expired sessions deleted.")
+
+
+@sessions.command("serve-store")
+@click.option(
+    "--address",
+    default=lambda: Config.SESSION_STORE_ADDRESS or "127.0.0.1:50000",
+    help="The host:port address to listen on.",
+)
+def serve_store(address):
+    """
+    Serve the in-memory session store shared by the workers configured with
+    SESSION_STORE=memory and SESSION_STORE_ADDRESS.
+    """
+
+    from app.stores.memory_session_store import serve_session_state
+
+    click.echo(f"Serving the session store at {address}.")
+    serve_session_state(parse_address(address), Config.SESSION_STORE_AUTHKEY.encode())
@@ -0,0 +1,58 @@
+"""
+Commands for measuring the startup of the application.
+"""
+
+import click
+
+from app.services import startup_profile_service
+
+
+@click.command("startup-profile")
+@click.option(
+    "--runs",
+    type=click.IntRange(min=1),
+    default=3,
+    show_default=True,
+    help="Number of starts measured. The fastest one is reported.",
+)
+@click.option(
+    "--top",
+    type=click.IntRange(min=1),
+    default=15,
+    show_default=True,
+    help="Number of packages listed in the import times.",
+)
+@click.option(
+    "--budget-ms",
+    type=click.FloatRange(min=0),
+    default=None,
+    help="Exit with an error if the application takes longer than this to start.",
+)
+def startup_profile(runs, top, budget_ms):
+    """
+    Start the application in a new interpreter, like a WSGI server does, and print the time spent
+    importing each package and in each phase of create_app.
+    """
+
+    try:
+        profile = startup_profile_service.profile_startup(runs)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+
+    click.echo(f"Imports ({profile.import_ms:.1f} ms):")
+    for package, ms in profile.imports[:top]:
+        click.echo(f"  {package:<32} {ms:8.1f} ms")
+
+    click.echo()
+    click.echo("create_app phases, imports included:")
+    for phase, ms in profile.phases:
+        click.echo(f"  {phase:<32} {ms:8.1f} ms")
+
+    click.echo()
+    click.echo(f"Total: {profile.total_ms:.1f} ms")
+
+    if budget_ms is not None and profile.total_ms > budget_ms:
+        raise click.ClickException(
+            f"The application took {profile.total_ms:.1f} ms to start, over the budget of "
+            f"{budget_ms:.1f} ms."
+        )
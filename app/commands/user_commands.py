@@ -0,0 +1,67 @@
+"""
+Commands for managing users, such as importing and exporting them in bulk.
+"""
+
+import click
+from flask.cli import AppGroup
+
+from app.services import export_service, user_import_service
+
+from .export_commands import add_export_command
+
+users = AppGroup("users", help="Manage users.")
+
+add_export_command(
+    users,
+    export_service.export_users,
+    "users",
+    "Only export users with at least one active session.",
+)
+
+
+@users.command("import")
+@click.argument("file", type=click.File("r", encoding="utf-8-sig"))
+@click.option(
+    "--format",
+    "file_format",
+    type=click.Choice(user_import_service.FORMATS),
+    default=None,
+    help="Format of the file. Detected from its extension by default.",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help="Number of users validated, hashed and inserted together.",
+)
+def import_users(file, file_format, batch_size):
+    """
+    Create users from a CSV file with name, email and password columns, or from a JSON Lines file
+    with one object with these keys per line. Use - to read from the standard input.
+    """
+
+    if file_format is None:
+        try:
+            file_format = user_import_service.detect_format(file.name)
+        except ValueError as e:
+            raise click.UsageError(str(e))
+
+    def report(result):
+        click.echo(f"{result.imported} users imported, {len(result.errors)} rows rejected.")
+
+    try:
+        result = user_import_service.import_users(
+            user_import_service.read_rows(file, file_format), batch_size, on_batch=report
+        )
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+
+    for error in result.errors:
+        email = f" ({error.email})" if error.email else ""
+        click.echo(f"Line {error.line}{email}: {error.message}")
+
+    click.echo(f"Done. {result.imported} users imported, {len(result.errors)} rows rejected.")
+
+    if result.errors:
+        raise SystemExit(1)
@@ -1 +1 @@
-from . import auth_controller, user_controller
+from . import auth_controller, metrics_controller, user_controller
@@ -2,16 +2,15 @@
 Controller for handling user authentication operations such as registration, login, logout, and
 checking authentication status. It uses Flask's request context to handle incoming JSON requests
 and returns appropriate success responses. The controller interacts with the auth service to
-perform the necessary operations and uses schemas for request validation.
+perform the necessary operations and uses schemas for request validation. The schemas are imported
+on first use, since only the endpoints that receive a body need them.
 """
 
 from flask import request
 
 from app.controllers.blueprints import api
 from app.controllers.dtos import SuccessResponseDto
-from app.services import auth_service
-
-from .schemas.auth_schemas import LoginSchema, RegisterSchema
+from app.services import auth_service, rate_limit_service
 
 
 @api.post("/auth/register")
@@ -22,10 +21,14 @@ def register():
 
     :return: A success response with a status code of 201 if the user is created successfully.
     :raises ValidationError: If the request body does not conform to the expected schema.
+    :raises TooManyRequestsException: If the client or the email has too many recent attempts.
     :raises EmailAlreadyInUseException: If the email is already associated with an existing user.
     """
 
-    body = RegisterSchema().load(request.json)  # type: ignore
+    from .schemas.auth_schemas import register_schema
+
+    body = register_schema.load(request.json)  # type: ignore
+    rate_limit_service.limit_register(request.remote_addr, body["email"])  # type: ignore
     auth_service.register(body["name"], body["email"], body["password"])  # type: ignore
     return SuccessResponseDto(201, "Usuário criado com sucesso.").to_response()
 
@@ -37,10 +40,14 @@ def login():
 
     :return: A success response with a status code of 200 if the login is successful.
     :raises ValidationError: If the request body does not conform to the expected schema.
+    :raises TooManyRequestsException: If the client or the email has too many recent attempts.
     :raises InvalidCredentialsException: If the email or password is incorrect.
     """
 
-    body = LoginSchema().load(request.json)  # type: ignore
+    from .schemas.auth_schemas import login_schema
+
+    body = login_schema.load(request.json)  # type: ignore
+    rate_limit_service.limit_login(request.remote_addr, body["email"])  # type: ignore
     auth_service.login(body["email"], body["password"])  # type: ignore
     return SuccessResponseDto(200, "Login realizado com sucesso.").to_response()
 
@@ -0,0 +1,28 @@
+"""
+Controller that exposes the runtime metrics of the application for monitoring. The endpoint is
+protected by the METRICS_TOKEN bearer token instead of a user session.
+"""
+
+from flask import request
+
+from app.controllers.blueprints import api
+from app.controllers.dtos import SuccessResponseDto
+from app.services import metrics_service
+
+
+@api.get("/metrics")
+def get_metrics():
+    """
+    GET endpoint to retrieve the runtime metrics of the application. It expects an Authorization
+    header with the metrics token as a bearer token.
+
+    :return: A success response with a status code of 200 and the metrics.
+    :raises UnauthorizedException: If the metrics token is missing, invalid or not configured.
+    """
+
+    metrics_service.authorize(request.headers.get("Authorization"))
+    return SuccessResponseDto(
+        200,
+        "Métricas obtidas com sucesso.",
+        metrics_service.collect(),
+    ).to_response()
@@ -1,5 +1,7 @@
 from marshmallow import Schema, fields, validate
 
+from .validators import password_policy
+
 
 class RegisterSchema(Schema):
     """
@@ -32,31 +34,7 @@ class RegisterSchema(Schema):
 
     password = fields.String(
         required=True,
-        validate=[
-            validate.Length(
-                min=8, max=128, error="Senha deve ter entre 8 e 128 caracteres."
-            ),
-            validate.Regexp(
-                r"^(?=.*[A-Z]).*$",
-                error="Senha deve conter pelo menos uma letra maiúscula.",
-            ),
-            validate.Regexp(
-                r"^(?=.*[a-z]).*$",
-                error="Senha deve conter pelo menos uma letra minúscula.",
-            ),
-            validate.Regexp(
-                r"^(?=.*\d).*$",
-                error="Senha deve conter pelo menos um dígito.",
-            ),
-            validate.Regexp(
-                r"^(?=.*[@$!%*?&#^~.,:;+=_\-\(\)\[\]\{\}<>|\\/\"\'\`]).*$",
-                error="Senha deve conter pelo menos um caractere especial (@, $, !, %, *, ?, &).",
-            ),
-            validate.Regexp(
-                r"^[A-Za-z\d@$!%*?&#^~.,:;+=_\-\(\)\[\]\{\}<>|\\/\"\'\`]+$",
-                error="Senha deve conter apenas letras, números e caracteres especiais.",
-            ),
-        ],
+        validate=password_policy,
         error_messages={"required": "Senha é obrigatória."},
     )
 
@@ -79,3 +57,8 @@ class LoginSchema(Schema):
         validate=validate.Length(min=1, error="Senha é obrigatória."),
         error_messages={"required": "Senha é obrigatória."},
     )
+
+
+# Schemas keep no state between loads, so one instance of each is shared by all requests
+register_schema = RegisterSchema()
+login_schema = LoginSchema()
@@ -1,5 +1,7 @@
 from marshmallow import Schema, fields, validate
 
+from .validators import password_policy
+
 
 class UpdateUserNameSchema(Schema):
     """
@@ -37,8 +39,7 @@ class UpdateUserEmailSchema(Schema):
 class UpdateUserPasswordSchema(Schema):
     """
     Schema for updating the user's password. It validates that the current password is provided and
-    that the new password meets specific criteria, including length, character types, and allowed
-    characters.
+    that the new password follows the same password policy as the registration.
     """
 
     current_password = fields.String(
@@ -48,29 +49,7 @@ class UpdateUserPasswordSchema(Schema):
 
     new_password = fields.String(
         required=True,
-        validate=[
-            validate.Length(min=8, max=128),
-            validate.Regexp(
-                r"^(?=.*[A-Z]).*$",
-                error="Senha deve conter pelo menos uma letra maiúscula.",
-            ),
-            validate.Regexp(
-                r"^(?=.*[a-z]).*$",
-                error="Senha deve conter pelo menos uma letra minúscula.",
-            ),
-            validate.Regexp(
-                r"^(?=.*\d).*$",
-                error="Senha deve conter pelo menos um dígito.",
-            ),
-            validate.Regexp(
-                r"^(?=.*[@$!%*?&]).*$",
-                error="Senha deve conter pelo menos um caractere especial (@, $, !, %, *, ?, &).",
-            ),
-            validate.Regexp(
-                r"^[A-Za-z\d@$!%*?&]{8,128}$",
-                error="Senha deve conter apenas letras, números e caracteres especiais (@, $, !, %, *, ?, &).",
-            ),
-        ],
+        validate=password_policy,
         error_messages={"required": "Senha é obrigatória."},
     )
 
@@ -85,3 +64,10 @@ class DeleteUserAccountSchema(Schema):
         required=True,
         error_messages={"required": "Senha é obrigatória."},
     )
+
+
+# Schemas keep no state between loads, so one instance of each is shared by all requests
+update_user_name_schema = UpdateUserNameSchema()
+update_user_email_schema = UpdateUserEmailSchema()
+update_user_password_schema = UpdateUserPasswordSchema()
+delete_user_account_schema = DeleteUserAccountSchema()
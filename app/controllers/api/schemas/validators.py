@@ -0,0 +1,68 @@
+import string
+
+from marshmallow import ValidationError, validate
+
+_SPECIAL_CHARACTERS = "@$!%*?&#^~.,:;+=_-()[]{}<>|\\/\"'`"
+PASSWORD_SPECIAL_CHARACTERS = frozenset(_SPECIAL_CHARACTERS)
+
+
+class PasswordPolicy(validate.Validator):
+    """
+    Validator of the password policy shared by the registration and the password update. A password
+    must have between 8 and 128 characters, with at least one uppercase letter, one lowercase
+    letter, one digit and one special character, and no other characters. The characters are
+    classified in a single pass over the set of characters of the password instead of one regular
+    expression per rule, and every rule that fails is reported, in order.
+    """
+
+    min_length = 8
+    max_length = 128
+
+    error_length = "Senha deve ter entre 8 e 128 caracteres."
+    error_uppercase = "Senha deve conter pelo menos uma letra maiúscula."
+    error_lowercase = "Senha deve conter pelo menos uma letra minúscula."
+    error_digit = "Senha deve conter pelo menos um dígito."
+    error_special = (
+        f"Senha deve conter pelo menos um caractere especial ({' '.join(_SPECIAL_CHARACTERS)})."
+    )
+    error_invalid = "Senha deve conter apenas letras, números e caracteres especiais."
+
+    def __call__(self, value):
+        errors = []
+
+        if not self.min_length <= len(value) <= self.max_length:
+            errors.append(self.error_length)
+
+        has_uppercase = has_lowercase = has_digit = has_special = has_invalid = False
+
+        for character in set(value):
+            if character in string.ascii_uppercase:
+                has_uppercase = True
+            elif character in string.ascii_lowercase:
+                has_lowercase = True
+            elif character in PASSWORD_SPECIAL_CHARACTERS:
+                has_special = True
+            # Like \d in the regular expressions this replaced, any Unicode decimal digit counts
+            elif character.isdecimal():
+                has_digit = True
+            else:
+                has_invalid = True
+
+        if not has_uppercase:
+            errors.append(self.error_uppercase)
+        if not has_lowercase:
+            errors.append(self.error_lowercase)
+        if not has_digit:
+            errors.append(self.error_digit)
+        if not has_special:
+            errors.append(self.error_special)
+        # An empty password does not consist of allowed characters either
+        if has_invalid or not value:
+            errors.append(self.error_invalid)
+
+        if errors:
+            raise ValidationError(errors)
+        return value
+
+
+password_policy = PasswordPolicy()
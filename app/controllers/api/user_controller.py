@@ -3,7 +3,7 @@ Controller for user-related operations. It provides endpoints to retrieve the cu
 information, update user details (name, email, password), and delete the user account. The
 controller uses Flask's request context to handle incoming JSON requests and returns appropriate
 success responses. It interacts with the user service to perform the necessary operations and uses
-schemas for request validation.
+schemas for request validation, imported on first use like in the auth controller.
 """
 
 from flask import request
@@ -12,13 +12,6 @@ from app.controllers.blueprints import api
 from app.controllers.dtos import SuccessResponseDto
 from app.services import user_service
 
-from .schemas.user_schemas import (
-    DeleteUserAccountSchema,
-    UpdateUserEmailSchema,
-    UpdateUserNameSchema,
-    UpdateUserPasswordSchema,
-)
-
 
 @api.get("/my-account")
 def get_current_user():
@@ -48,7 +41,9 @@ def update_user_name():
     :raises UnauthorizedException: If the user is not authenticated or the session does not exist.
     """
 
-    body = UpdateUserNameSchema().load(request.json)  # type: ignore
+    from .schemas.user_schemas import update_user_name_schema
+
+    body = update_user_name_schema.load(request.json)  # type: ignore
     user_service.update_current_user_name(body["name"])  # type: ignore
     return SuccessResponseDto(
         200,
@@ -67,7 +62,9 @@ def update_user_email():
     :raises EmailAlreadyInUseException: If the new email is already associated with another user
     """
 
-    body = UpdateUserEmailSchema().load(request.json)  # type: ignore
+    from .schemas.user_schemas import update_user_email_schema
+
+    body = update_user_email_schema.load(request.json)  # type: ignore
     user_service.update_current_user_email(body["email"])  # type: ignore
     return SuccessResponseDto(
         200,
@@ -87,7 +84,9 @@ def update_user_password():
     :raises InvalidCredentialsException: If the current password is incorrect.
     """
 
-    body = UpdateUserPasswordSchema().load(request.json)  # type: ignore
+    from .schemas.user_schemas import update_user_password_schema
+
+    body = update_user_password_schema.load(request.json)  # type: ignore
     user_service.update_current_user_password(
         body["current_password"],  # type: ignore
         body["new_password"],  # type: ignore
@@ -110,7 +109,9 @@ def delete_user_account():
     :raises InvalidCredentialsException: If the provided password is incorrect.
     """
 
-    body = DeleteUserAccountSchema().load(request.json)  # type: ignore
+    from .schemas.user_schemas import delete_user_account_schema
+
+    body = delete_user_account_schema.load(request.json)  # type: ignore
     user_service.delete_current_user(body["password"])  # type: ignore
     return SuccessResponseDto(
         200,
@@ -5,12 +5,25 @@ authentication.
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional, Union
 
-from flask import jsonify, make_response
+from flask import current_app
 
 from app.services.session_service import add_session_cookies, clear_session_cookies
 
+STATIC_FIELDS = frozenset(("status_code", "message"))
+
+
+@lru_cache(maxsize=256)
+def _serialize_static_body(provider, debug, items):
+    """
+    Serialize a body made only of a status code and a message. Most responses have a constant
+    message, so their body is only serialized once per provider.
+    """
+
+    return provider.response(dict(items)).get_data()
+
 
 @dataclass
 class ResponseDto:
@@ -29,7 +42,8 @@ class ResponseDto:
 
     def to_response(self, clear_session=False):
         """
-        Converts the DTO into a Flask response object with JSON body and session cookies.
+        Converts the DTO into a Flask response object with JSON body and session cookies. Bodies
+        with only a status code and a message are serialized once and then reused.
 
         :param clear_session: If True, clears the session cookies; otherwise, adds session cookies.
         :return: A Flask response object with the JSON body and session cookies.
@@ -37,7 +51,17 @@ class ResponseDto:
 
         # Filter out None values from the DTO's attributes to avoid sending them in the response
         body = {k: v for k, v in self.__dict__.items() if v is not None}
-        response = make_response(jsonify(body), self.status_code)
+
+        if body.keys() <= STATIC_FIELDS:
+            # The debug flag is part of the key since it makes the provider indent the output
+            response = current_app.response_class(
+                _serialize_static_body(current_app.json, current_app.debug, tuple(body.items())),
+                status=self.status_code,
+                mimetype=current_app.json.mimetype,
+            )
+        else:
+            response = current_app.json.response(body)
+            response.status_code = self.status_code
 
         if clear_session:
             return clear_session_cookies(response)
@@ -35,13 +35,16 @@ def api_handle_exception(e):
 def api_handle_http_exception(e):
     """
     Handles HTTP exceptions raised by the application. It returns an ErrorResponseDto with the
-    status code and message from the exception.
+    status code and message from the exception, along with the headers of the exception, such as
+    Retry-After.
 
     :param e: The HttpException that was raised.
     :return: An ErrorResponseDto with the status code and message from the exception.
     """
 
-    return ErrorResponseDto(e.status_code, e.message).to_response()
+    response = ErrorResponseDto(e.status_code, e.message).to_response()
+    response.headers.update(e.headers)
+    return response
 
 
 @api.errorhandler(ValidationError)
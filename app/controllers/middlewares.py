@@ -17,13 +17,14 @@ from .blueprints import api, views
 def api_before_request():
     """
     Middleware to validate the session for API requests. It checks if the user is authenticated
-    before allowing access to any API endpoints except for login, register, and auth status endpoints.
+    before allowing access to any API endpoints except for login, register, auth status and metrics
+    endpoints.
 
     :return: None
     :raises UnauthorizedException: If the session is invalid or the user is not authenticated.
     """
 
-    if request.endpoint in ["api.login", "api.register", "api.auth_status"]:
+    if request.endpoint in ["api.login", "api.register", "api.auth_status", "api.get_metrics"]:
         return
 
     session_service.validate_session()
@@ -1,13 +1,16 @@
 from flask import render_template
 
 from app.controllers.blueprints import views
+from app.services.view_cache_service import cached_view
 
 
 @views.get("/entrar")
+@cached_view()
 def login():
     return render_template("login.html")
 
 
 @views.get("/cadastro")
+@cached_view()
 def register():
     return render_template("register.html")
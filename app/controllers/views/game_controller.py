@@ -1,23 +1,28 @@
 from flask import render_template
 
 from app.controllers.blueprints import views
+from app.services.view_cache_service import cached_view
 
 
 @views.get("/jogos/vamos-contar")
+@cached_view()
 def count_with_me_game():
     return render_template("count-with-me-game.html")
 
 
 @views.get("/jogos/jogo-da-memoria")
+@cached_view()
 def memory_game():
     return render_template("memory-game.html")
 
 
 @views.get("/jogos/quem-sou-eu")
+@cached_view()
 def who_am_i_game():
     return render_template("who-am-i-game.html")
 
 
 @views.get("/jogos/jogo-das-cores")
+@cached_view()
 def color_game():
     return render_template("color-game.html")
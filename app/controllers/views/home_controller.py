@@ -1,8 +1,10 @@
 from flask import render_template
 
 from app.controllers.blueprints import views
+from app.services.view_cache_service import cached_view
 
 
 @views.get("/inicio")
+@cached_view()
 def home():
     return render_template("home.html")
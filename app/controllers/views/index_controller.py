@@ -1,8 +1,10 @@
 from flask import render_template
 
 from app.controllers.blueprints import views
+from app.services.view_cache_service import cached_view
 
 
 @views.get("/")
+@cached_view()
 def index():
     return render_template("index.html")
@@ -2,9 +2,11 @@ from flask import render_template, request
 
 from app.controllers.blueprints import views
 from app.services import user_service
+from app.services.view_cache_service import cached_view
 
 
 @views.get("/minha-conta")
+@cached_view(vary_args=("editar", "excluir"), per_user=True)
 def my_account():
     editar = request.args.get("editar")
     delete = request.args.get("excluir") is not None
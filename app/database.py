@@ -0,0 +1,227 @@
+"""
+Configuration of the database engine from the DB_* and SQLITE_* settings. The settings are
+validated when the application starts, the pool options are passed to Flask-SQLAlchemy and, with
+SQLite, every new connection is configured with the journal mode, synchronous level, busy timeout,
+cache size and memory map size.
+
+It also routes read-only queries to the read replicas listed in DATABASE_REPLICA_URLS. Queries are
+only sent to a replica while replica reads are enabled, which is the case for the whole of GET,
+HEAD and OPTIONS requests and inside `replica_reads`. Writes, flushes and locking reads always go to
+the primary, and once a session has written to the primary, the rest of its queries follow, so a
+request always reads its own writes.
+"""
+
+import random
+import sqlite3
+from contextlib import contextmanager
+
+from flask import request
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import Select, UpdateBase, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
+
+from config import Config
+
+REPLICA_BIND_PREFIX = "replica_"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+SQLITE_JOURNAL_MODES = ("delete", "truncate", "persist", "memory", "wal", "off")
+SQLITE_SYNCHRONOUS_LEVELS = ("off", "normal", "full", "extra")
+
+
+def _is_memory_sqlite(uri):
+    url = make_url(uri)
+
+    return url.get_backend_name() == "sqlite" and (
+        url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+    )
+
+
+def validate_config():
+    """
+    Check that the database engine settings have valid values.
+
+    :return: None
+    :raises ValueError: If a setting is invalid, with the list of every invalid setting.
+    """
+
+    errors = []
+
+    if Config.DB_POOL_SIZE < 1:
+        errors.append("DB_POOL_SIZE must be at least 1.")
+    if Config.DB_MAX_OVERFLOW < -1:
+        errors.append("DB_MAX_OVERFLOW must be -1 (no limit) or more.")
+    if Config.DB_POOL_TIMEOUT_SECS <= 0:
+        errors.append("DB_POOL_TIMEOUT_SECS must be positive.")
+    if Config.DB_POOL_RECYCLE_SECS < -1:
+        errors.append("DB_POOL_RECYCLE_SECS must be -1 (never) or more.")
+    if Config.SQLITE_JOURNAL_MODE.lower() not in SQLITE_JOURNAL_MODES:
+        errors.append(f"SQLITE_JOURNAL_MODE must be one of {', '.join(SQLITE_JOURNAL_MODES)}.")
+    if Config.SQLITE_SYNCHRONOUS.lower() not in SQLITE_SYNCHRONOUS_LEVELS:
+        errors.append(f"SQLITE_SYNCHRONOUS must be one of {', '.join(SQLITE_SYNCHRONOUS_LEVELS)}.")
+    if Config.SQLITE_BUSY_TIMEOUT_MS < 0:
+        errors.append("SQLITE_BUSY_TIMEOUT_MS must not be negative.")
+    if Config.SQLITE_MMAP_SIZE < 0:
+        errors.append("SQLITE_MMAP_SIZE must not be negative.")
+
+    if errors:
+        raise ValueError(f"Invalid database configuration: {' '.join(errors)}")
+
+
+def engine_options(uri):
+    """
+    Build the options of the engine for the given database URI. In-memory SQLite databases keep a
+    single connection per thread, so the pool size options do not apply to them.
+
+    :param uri: The database URI.
+    :return: A dictionary of keyword arguments for `create_engine`.
+    """
+
+    options = {"pool_pre_ping": Config.DB_POOL_PRE_PING}
+
+    if not _is_memory_sqlite(uri):
+        options.update(
+            pool_size=Config.DB_POOL_SIZE,
+            max_overflow=Config.DB_MAX_OVERFLOW,
+            pool_timeout=Config.DB_POOL_TIMEOUT_SECS,
+            pool_recycle=Config.DB_POOL_RECYCLE_SECS,
+        )
+
+    return options
+
+
+class RoutingSession(FlaskSession):
+    """
+    Session that sends read-only queries to a read replica while replica reads are enabled and the
+    session has not written to the primary yet. Everything else goes to the bind chosen by
+    Flask-SQLAlchemy.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or isinstance(clause, UpdateBase):
+                self.info["primary_only"] = True
+            elif self._reads_from_replica(clause):
+                return random.choice(replica_engines(self._db))
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_from_replica(self, clause):
+        return (
+            self.info.get("replica_reads", False)
+            and not self.info.get("primary_only", False)
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+            and bool(replica_engines(self._db))
+        )
+
+
+def replica_engines(db):
+    """
+    Retrieve the engines of the read replicas.
+
+    :param db: The Flask-SQLAlchemy extension.
+    :return: A list of engines, empty if no replica is configured.
+    """
+
+    return [
+        engine
+        for key, engine in db.engines.items()
+        if key is not None and key.startswith(REPLICA_BIND_PREFIX)
+    ]
+
+
+@contextmanager
+def replica_reads():
+    """
+    Enable replica reads for the current session until the end of the block. Once the session
+    writes to the primary, its queries go to the primary again.
+    """
+
+    from .extensions import db
+
+    info = db.session.info
+    previous = info.get("replica_reads", False)
+    info["replica_reads"] = True
+
+    try:
+        yield
+    finally:
+        info["replica_reads"] = previous
+
+
+def _enable_replica_reads_for_safe_requests():
+    if request.method in SAFE_METHODS:
+        from .extensions import db
+
+        db.session.info["replica_reads"] = True
+
+
+def init_app(app):
+    """
+    Validate the database engine settings and pass the engine options and the replica binds to
+    Flask-SQLAlchemy. It must be called before `db.init_app`. Options already set in
+    SQLALCHEMY_ENGINE_OPTIONS take precedence.
+
+    :param app: The Flask application.
+    :return: None
+    :raises ValueError: If a setting is invalid.
+    """
+
+    validate_config()
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        **engine_options(app.config["SQLALCHEMY_DATABASE_URI"]),
+        **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}),
+    }
+
+    if Config.DATABASE_REPLICA_URLS:
+        app.config["SQLALCHEMY_BINDS"] = {
+            **{
+                f"{REPLICA_BIND_PREFIX}{position}": {"url": url, **engine_options(url)}
+                for position, url in enumerate(Config.DATABASE_REPLICA_URLS)
+            },
+            **app.config.get("SQLALCHEMY_BINDS", {}),
+        }
+        app.before_request(_enable_replica_reads_for_safe_requests)
+
+
+@event.listens_for(Engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+
+    cursor = dbapi_connection.cursor()
+    try:
+        # The busy timeout is set first, since changing the journal mode may wait for a lock
+        cursor.execute(f"PRAGMA busy_timeout = {int(Config.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA journal_mode = {Config.SQLITE_JOURNAL_MODE.lower()}")
+        cursor.execute(f"PRAGMA synchronous = {Config.SQLITE_SYNCHRONOUS.lower()}")
+        cursor.execute(f"PRAGMA cache_size = {int(Config.SQLITE_CACHE_SIZE)}")
+        cursor.execute(f"PRAGMA mmap_size = {int(Config.SQLITE_MMAP_SIZE)}")
+    finally:
+        cursor.close()
+
+
+def get_pool_metrics(engine):
+    """
+    Retrieve the current state of the connection pool of an engine.
+
+    :param engine: The engine to inspect.
+    :return: A dictionary with the pool class and, for queue pools, the pool size and the number of
+             connections checked in, checked out and in overflow.
+    """
+
+    pool = engine.pool
+    metrics = {"pool": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        metrics.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # Negative while the pool itself still has room for new connections
+            overflow=max(pool.overflow(), 0),
+        )
+
+    return metrics
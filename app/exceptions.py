@@ -1,3 +1,5 @@
+from typing import Optional
+
 # Common exceptions for the application
 
 
@@ -17,9 +19,10 @@ class UserNotFoundException(Exception):
 
 
 class HttpException(Exception):
-    def __init__(self, status_code: int, message: str):
+    def __init__(self, status_code: int, message: str, headers: Optional[dict] = None):
         self.status_code = status_code
         self.message = message
+        self.headers = headers or {}
 
         super().__init__(self.message)
 
@@ -29,6 +32,14 @@ class EmailAlreadyInUseException(HttpException):
         super().__init__(status_code=409, message=message)
 
 
+class ConcurrentModificationException(HttpException):
+    def __init__(
+        self,
+        message: str = "Os dados foram alterados por outra requisição. Tente novamente.",
+    ):
+        super().__init__(status_code=409, message=message)
+
+
 class InvalidCredentialsException(HttpException):
     def __init__(self, message: str = "E-mail ou senha incorretos."):
         super().__init__(status_code=401, message=message)
@@ -37,3 +48,29 @@ class InvalidCredentialsException(HttpException):
 class UnauthorizedException(HttpException):
     def __init__(self, message: str = "Não autorizado."):
         super().__init__(status_code=401, message=message)
+
+
+class ServiceUnavailableException(HttpException):
+    def __init__(
+        self,
+        message: str = "Serviço temporariamente indisponível. Tente novamente em instantes.",
+        retry_after: int = 1,
+    ):
+        super().__init__(
+            status_code=503,
+            message=message,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class TooManyRequestsException(HttpException):
+    def __init__(
+        self,
+        message: str = "Muitas tentativas. Tente novamente mais tarde.",
+        retry_after: int = 1,
+    ):
+        super().__init__(
+            status_code=429,
+            message=message,
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -1,22 +1,12 @@
-from flask_bcrypt import Bcrypt
-from flask_marshmallow import Marshmallow
-from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import DeclarativeBase
 
+from .database import RoutingSession
+
 
 # SQLALchemy
 class Base(DeclarativeBase):
     pass
 
 
-db = SQLAlchemy(model_class=Base)
-
-# Marshmallow
-ma = Marshmallow()
-
-# Flask-Migrate
-migrate = Migrate()
-
-# Bcrypt
-bcrypt = Bcrypt()
+db = SQLAlchemy(model_class=Base, session_options={"class_": RoutingSession})
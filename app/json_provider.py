@@ -0,0 +1,86 @@
+"""
+JSON providers of the application. The orjson provider serializes with the optional orjson package,
+which is several times faster than the standard library, and produces the same JSON as Flask's
+default provider: keys are sorted and dates, times and other types unknown to orjson go through
+Flask's `default` function. Unlike the default provider, non-ASCII characters are written as UTF-8
+instead of being escaped.
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+from config import Config
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider that uses orjson. Calls with arguments orjson does not support, such as a custom
+    encoder class, are passed on to the standard library.
+
+    :raises RuntimeError: If orjson is not installed.
+    """
+
+    _supported_kwargs = frozenset(("default", "ensure_ascii", "sort_keys", "indent", "separators"))
+
+    def __init__(self, app):
+        try:
+            import orjson
+        except ImportError:
+            raise RuntimeError("The orjson JSON provider requires the orjson package.")
+
+        super().__init__(app)
+        self._orjson = orjson
+
+    def dumps(self, obj, **kwargs):
+        if not kwargs.keys() <= self._supported_kwargs:
+            return super().dumps(obj, **kwargs)
+
+        orjson = self._orjson
+        # Dates and times go to Flask's default function, which formats them as HTTP dates
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+
+        try:
+            return orjson.dumps(
+                obj, default=kwargs.get("default", self.default), option=option
+            ).decode()
+        except orjson.JSONEncodeError:
+            # For example, integers larger than 64 bits
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return self._orjson.loads(s)
+
+
+PROVIDERS = {
+    "orjson": OrjsonProvider,
+    "stdlib": DefaultJSONProvider,
+}
+
+
+def init_app(app):
+    """
+    Set the JSON provider of the application from the JSON_PROVIDER setting.
+
+    :param app: The Flask application.
+    :return: None
+    :raises ValueError: If the provider name is unknown.
+    :raises RuntimeError: If orjson is requested but not installed.
+    """
+
+    name = Config.JSON_PROVIDER
+
+    if name == "auto":
+        try:
+            app.json = OrjsonProvider(app)
+        except RuntimeError:
+            app.json = DefaultJSONProvider(app)
+        return
+
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown JSON provider: {name}. Use auto, {', '.join(PROVIDERS)}.")
+    app.json = PROVIDERS[name](app)
@@ -1,14 +1,18 @@
+import hashlib
 import secrets
 from datetime import datetime, timedelta, timezone
-from uuid import UUID, uuid4
+from typing import Optional
+from uuid import UUID
 
 from sqlalchemy import UUID as SQLAlchemyUUID
-from sqlalchemy import DateTime, ForeignKey
+from sqlalchemy import DateTime, ForeignKey, LargeBinary
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.extensions import db
 from config import Config
 
+from .ids import uuid7
+
 
 class Session(db.Model):
     __tablename__ = "sessions"
@@ -16,12 +20,11 @@ class Session(db.Model):
     id: Mapped[UUID] = mapped_column(
         SQLAlchemyUUID(as_uuid=True),
         primary_key=True,
-        default=uuid4,
-        unique=True,
+        default=uuid7,
         nullable=False,
     )
 
-    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"))
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), index=True)
 
     user: Mapped["User"] = relationship(back_populates="sessions")  # type: ignore
 
@@ -40,16 +43,31 @@ class Session(db.Model):
     expires_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),  # Ensure the column is timezone-aware
         default=lambda: Session.calculate_expiration(),
+        index=True,
         nullable=False,
     )
 
-    refresh_token: Mapped[str] = mapped_column(
-        default=lambda: Session.generate_refresh_token(),
+    # SHA-256 digest of the refresh token. The token itself is only known by the client.
+    refresh_token_hash: Mapped[Optional[bytes]] = mapped_column(
+        LargeBinary(32),
         index=True,
         unique=True,
-        nullable=False,
+        nullable=True,
+    )
+
+    # Plaintext refresh token of sessions written before refresh tokens were hashed. It is only
+    # read while REFRESH_TOKEN_LEGACY_LOOKUP is enabled and cleared when the session is rotated.
+    refresh_token: Mapped[Optional[str]] = mapped_column(
+        index=True,
+        unique=True,
+        nullable=True,
     )
 
+    # Incremented on every update, like the version of users.
+    version: Mapped[int] = mapped_column(nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
+
     @staticmethod
     def calculate_expiration() -> datetime:
         expiration_time = Config.SESSION_EXPIRATION_SECS
@@ -59,6 +77,10 @@ class Session(db.Model):
     def generate_refresh_token() -> str:
         return secrets.token_urlsafe(32)
 
+    @staticmethod
+    def hash_refresh_token(refresh_token: str) -> bytes:
+        return hashlib.sha256(refresh_token.encode()).digest()
+
     def is_expired(self) -> bool:
         return datetime.now(timezone.utc) > self.expires_at.replace(tzinfo=timezone.utc)
 
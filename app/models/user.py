@@ -1,11 +1,15 @@
-from typing import List
-from uuid import UUID, uuid4
+from datetime import datetime, timezone
+from typing import List, Optional
+from uuid import UUID
 
 from sqlalchemy import UUID as SQLAlchemyUUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import DateTime
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from app.extensions import db
 
+from .ids import uuid7
+
 
 class User(db.Model):
     __tablename__ = "users"
@@ -13,17 +17,31 @@ class User(db.Model):
     id: Mapped[UUID] = mapped_column(
         SQLAlchemyUUID(as_uuid=True),
         primary_key=True,
-        default=uuid4,
-        unique=True,
+        default=uuid7,
         nullable=False,
     )
 
     name: Mapped[str] = mapped_column(nullable=False)
 
-    email: Mapped[str] = mapped_column(nullable=False, unique=True)
+    email: Mapped[str] = mapped_column(nullable=False)
+
+    # Email used for lookups and uniqueness, so that emails differing only by case or surrounding
+    # spaces belong to the same account. It is kept in sync with the email by `validate_email`.
+    email_normalized: Mapped[str] = mapped_column(nullable=False, unique=True)
 
     password_hash: Mapped[str] = mapped_column(nullable=False)
 
+    # Unknown for users created before the column was added with a random (version 4) id.
+    created_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=True,
+    )
+
+    # Incremented on every update. Updates and deletes only match the version that was read, so
+    # concurrent modifications are detected without locking the row.
+    version: Mapped[int] = mapped_column(nullable=False, server_default="1")
+
     sessions: Mapped[List["Session"]] = relationship(  # type: ignore
         "Session",
         back_populates="user",
@@ -31,5 +49,16 @@ class User(db.Model):
         lazy="dynamic",
     )
 
+    __mapper_args__ = {"version_id_col": version}
+
+    @staticmethod
+    def normalize_email(email: str) -> str:
+        return email.strip().lower()
+
+    @validates("email")
+    def validate_email(self, key: str, email: str) -> str:
+        self.email_normalized = User.normalize_email(email)
+        return email
+
     def __repr__(self) -> str:
         return f"<User {self.name} {self.email}>"
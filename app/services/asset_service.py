@@ -0,0 +1,491 @@
+"""
+This module builds the static assets and serves them back to the templates and the browsers.
+
+`build_images` resizes every image under static/images to several widths and encodes each width as
+WebP and, when Pillow supports it, AVIF. The variants are described by a manifest that the templates
+and the game scripts use to emit `srcset` attributes.
+
+`build_static` copies every static file to a name that contains a hash of its content, along with
+gzip and, when the brotli package is installed, brotli versions of the text files. Paths to other
+static files inside the stylesheets and scripts are rewritten to the copies first, so a change to an
+image also changes the name of the script that uses it. `url_for('static', ...)` then returns the
+copies, which are served with a one-year immutable Cache-Control and compressed when the browser
+accepts it, so returning visitors do not request them again.
+
+Without the manifests, the original files are served as before. The copies are also not used in
+debug mode, where the original files are edited. Pillow is only needed to build the images, and
+brotli to build the brotli versions, not to serve them.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import mimetypes
+import os
+import re
+import shutil
+from dataclasses import dataclass, field
+
+from flask import current_app, request, send_from_directory, url_for
+from markupsafe import Markup, escape
+
+IMAGE_DIR = "images"
+BUILD_DIR = "dist"
+IMAGE_MANIFEST = f"{BUILD_DIR}/images.json"
+STATIC_MANIFEST = f"{BUILD_DIR}/static.json"
+IMAGE_WIDTHS = (128, 256, 512, 1024)
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+# Files whose paths to other static files are rewritten, in build order: stylesheets may reference
+# images and scripts may reference stylesheets
+REWRITTEN_EXTENSIONS = (".css", ".js")
+COMPRESSED_EXTENSIONS = (".css", ".js", ".json", ".svg", ".ico", ".txt", ".map")
+# Preferred encoding first, with the suffix of its files
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+IMMUTABLE_MAX_AGE_SECS = 31536000
+
+# Best format first, which is also the order of the <source> elements
+FORMATS = {
+    "avif": {"mimetype": "image/avif", "options": {"quality": 50, "speed": 6}},
+    "webp": {"mimetype": "image/webp", "options": {"quality": 80, "method": 4}},
+}
+
+
+@dataclass
+class ImageBuildResult:
+    """
+    The variants built from one image.
+
+    :ivar source: The path of the image, relative to the static folder.
+    :ivar original_bytes: The size of the image.
+    :ivar variants: A dictionary of the variants of each format, each variant being a dictionary
+                    with its width, file and size in bytes, from the narrowest to the widest.
+    """
+
+    source: str
+    original_bytes: int
+    variants: dict = field(default_factory=dict)
+
+    def widest_bytes(self, image_format):
+        """
+        Retrieve the size of the widest variant of a format, which replaces the original image on
+        large screens.
+
+        :param image_format: The format of the variant.
+        :return: The size in bytes.
+        """
+
+        return self.variants[image_format][-1]["bytes"]
+
+
+def supported_formats():
+    """
+    List the formats that the installed Pillow can encode.
+
+    :return: A list of format names, best first.
+    :raises RuntimeError: If Pillow is not installed.
+    """
+
+    try:
+        from PIL import features
+    except ImportError:
+        raise RuntimeError("Building the images requires the Pillow package.")
+
+    return [name for name in FORMATS if features.check(name)]
+
+
+def _find_images(static_folder):
+    for root, directories, files in os.walk(os.path.join(static_folder, IMAGE_DIR)):
+        directories.sort()
+        for name in sorted(files):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                path = os.path.join(root, name)
+                yield os.path.relpath(path, static_folder).replace(os.sep, "/")
+
+
+def _build_image(static_folder, source, widths, formats):
+    from PIL import Image
+
+    path = os.path.join(static_folder, source)
+    result = ImageBuildResult(source, os.path.getsize(path))
+    stem = os.path.splitext(source)[0]
+
+    with Image.open(path) as original:
+        has_alpha = original.mode in ("RGBA", "LA") or "transparency" in original.info
+        image = original.convert("RGBA" if has_alpha else "RGB")
+
+    # Images are never enlarged, and images narrower than a width are kept at their own width
+    image_widths = sorted({min(width, image.width) for width in widths})
+
+    for width in image_widths:
+        height = max(round(image.height * width / image.width), 1)
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+
+        for image_format in formats:
+            buffer = io.BytesIO()
+            resized.save(buffer, image_format.upper(), **FORMATS[image_format]["options"])
+            content = buffer.getvalue()
+
+            digest = hashlib.sha256(content).hexdigest()[:10]
+            file = f"{BUILD_DIR}/{stem}-{width}w.{digest}.{image_format}"
+            os.makedirs(os.path.dirname(os.path.join(static_folder, file)), exist_ok=True)
+            with open(os.path.join(static_folder, file), "wb") as output:
+                output.write(content)
+
+            result.variants.setdefault(image_format, []).append(
+                {"width": width, "height": height, "file": file, "bytes": len(content)}
+            )
+
+    return result, {"width": image.width, "height": image.height}
+
+
+def build_images(static_folder, widths=IMAGE_WIDTHS, formats=None, on_image=None):
+    """
+    Build the variants of every image under static/images and write the image manifest. The
+    variants of a previous build are removed first.
+
+    :param static_folder: The static folder of the application.
+    :param widths: The widths of the variants, in pixels.
+    :param formats: The formats of the variants. Defaults to every format Pillow can encode.
+    :param on_image: Optional callback called with the ImageBuildResult of each image.
+    :return: A list with the ImageBuildResult of each image.
+    :raises RuntimeError: If Pillow is not installed or cannot encode one of the formats.
+    """
+
+    available = supported_formats()
+    formats = [name for name in FORMATS if name in (formats or available)]
+
+    for name in formats:
+        if name not in available:
+            raise RuntimeError(f"The installed Pillow cannot encode {name} images.")
+
+    images_build_dir = os.path.join(static_folder, BUILD_DIR, IMAGE_DIR)
+    shutil.rmtree(images_build_dir, ignore_errors=True)
+
+    results = []
+    manifest = {}
+
+    for source in _find_images(static_folder):
+        result, size = _build_image(static_folder, source, widths, formats)
+        results.append(result)
+        manifest[source] = {
+            **size,
+            "variants": {
+                image_format: [
+                    {"width": variant["width"], "file": variant["file"]} for variant in variants
+                ]
+                for image_format, variants in result.variants.items()
+            },
+        }
+
+        if on_image:
+            on_image(result)
+
+    manifest_path = os.path.join(static_folder, IMAGE_MANIFEST)
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    with open(f"{manifest_path}.tmp", "w", encoding="utf-8") as output:
+        json.dump(manifest, output, indent=2, sort_keys=True)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+
+    return results
+
+
+def load_image_manifest(static_folder):
+    """
+    Read the image manifest written by `build_images`.
+
+    :param static_folder: The static folder of the application.
+    :return: The manifest, or an empty dictionary if the images have not been built.
+    """
+
+    try:
+        with open(os.path.join(static_folder, IMAGE_MANIFEST), encoding="utf-8") as manifest:
+            return json.load(manifest)
+    except FileNotFoundError:
+        return {}
+
+
+@dataclass
+class StaticBuildResult:
+    """
+    The fingerprinted copy of one static file.
+
+    :ivar source: The path of the file, relative to the static folder.
+    :ivar file: The path of the copy, relative to the static folder.
+    :ivar original_bytes: The size of the copy.
+    :ivar encoded_bytes: A dictionary with the size of each compressed version of the copy. Versions
+                         that are not smaller than the copy are not written.
+    """
+
+    source: str
+    file: str
+    original_bytes: int
+    encoded_bytes: dict = field(default_factory=dict)
+
+
+def _compress(content, encoding):
+    if encoding == "gzip":
+        # A fixed mtime keeps the output identical between builds
+        return gzip.compress(content, compresslevel=9, mtime=0)
+
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli.compress(content, quality=11)
+
+
+def _find_static_files(static_folder):
+    for root, directories, files in os.walk(static_folder):
+        directories.sort()
+        if os.path.relpath(root, static_folder) == ".":
+            directories[:] = [directory for directory in directories if directory != BUILD_DIR]
+
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            yield os.path.relpath(path, static_folder).replace(os.sep, "/")
+
+
+def _build_order(source):
+    extension = os.path.splitext(source)[1].lower()
+    rank = REWRITTEN_EXTENSIONS.index(extension) + 1 if extension in REWRITTEN_EXTENSIONS else 0
+    return rank, source
+
+
+def _remove_static_build(static_folder):
+    for entry in load_static_manifest(static_folder).values():
+        for suffix in ("", *ENCODINGS.values()):
+            try:
+                os.remove(os.path.join(static_folder, entry["file"] + suffix))
+            except FileNotFoundError:
+                pass
+
+
+def build_static(static_folder, static_url_path="/static", on_file=None):
+    """
+    Copy every static file to a name that contains a hash of its content, compress the copies of
+    the text files and write the static manifest. The copies of a previous build are removed first.
+    The image variants are not copied, since their names already contain a hash.
+
+    :param static_folder: The static folder of the application.
+    :param static_url_path: The URL prefix of the static files, which is rewritten in the
+                            stylesheets and scripts.
+    :param on_file: Optional callback called with the StaticBuildResult of each file.
+    :return: A list with the StaticBuildResult of each file.
+    """
+
+    _remove_static_build(static_folder)
+
+    static_url_path = static_url_path.rstrip("/")
+    # The path ends at whitespace, a quote, a parenthesis, a query string or a fragment
+    static_url = re.compile(re.escape(f"{static_url_path}/") + r"""([^\s'"()?#]+)""")
+    results = []
+    manifest = {}
+
+    def fingerprinted_url(match):
+        entry = manifest.get(match.group(1))
+        return f"{static_url_path}/{entry['file']}" if entry else match.group(0)
+
+    for source in sorted(_find_static_files(static_folder), key=_build_order):
+        with open(os.path.join(static_folder, source), "rb") as input_file:
+            content = input_file.read()
+
+        stem, extension = os.path.splitext(source)
+        if extension.lower() in REWRITTEN_EXTENSIONS:
+            content = static_url.sub(fingerprinted_url, content.decode("utf-8")).encode("utf-8")
+
+        digest = hashlib.sha256(content).hexdigest()[:10]
+        file = f"{BUILD_DIR}/{stem}.{digest}{extension}"
+        path = os.path.join(static_folder, file)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as output:
+            output.write(content)
+
+        result = StaticBuildResult(source, file, len(content))
+        if extension.lower() in COMPRESSED_EXTENSIONS:
+            for encoding, suffix in ENCODINGS.items():
+                compressed = _compress(content, encoding)
+                if compressed is not None and len(compressed) < len(content):
+                    with open(path + suffix, "wb") as output:
+                        output.write(compressed)
+                    result.encoded_bytes[encoding] = len(compressed)
+
+        results.append(result)
+        manifest[source] = {"file": file, "encodings": list(result.encoded_bytes)}
+
+        if on_file:
+            on_file(result)
+
+    manifest_path = os.path.join(static_folder, STATIC_MANIFEST)
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    with open(f"{manifest_path}.tmp", "w", encoding="utf-8") as output:
+        json.dump(manifest, output, indent=2, sort_keys=True)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+
+    return results
+
+
+def load_static_manifest(static_folder):
+    """
+    Read the static manifest written by `build_static`.
+
+    :param static_folder: The static folder of the application.
+    :return: The manifest, or an empty dictionary if the static files have not been built.
+    """
+
+    try:
+        with open(os.path.join(static_folder, STATIC_MANIFEST), encoding="utf-8") as manifest:
+            return json.load(manifest)
+    except FileNotFoundError:
+        return {}
+
+
+def image_srcset(filename, image_format="webp"):
+    """
+    Build the `srcset` attribute of the variants of an image in one format.
+
+    :param filename: The path of the original image, relative to the static folder.
+    :param image_format: The format of the variants.
+    :return: The value of the attribute, or an empty string if there is no such variant.
+    """
+
+    entry = current_app.extensions["image_manifest"].get(filename)
+    if entry is None or image_format not in entry["variants"]:
+        return ""
+
+    return ", ".join(
+        f"{url_for('static', filename=variant['file'])} {variant['width']}w"
+        for variant in entry["variants"][image_format]
+    )
+
+
+def image_variants(prefix):
+    """
+    Collect the `srcset` of every format of the images under a directory, for the game scripts.
+
+    :param prefix: The directory of the images, relative to the static folder, such as
+                   "images/memoryGame/".
+    :return: A dictionary that maps the URL of each original image to the `srcset` of each format.
+    """
+
+    return {
+        url_for("static", filename=source): {
+            image_format: image_srcset(source, image_format) for image_format in entry["variants"]
+        }
+        for source, entry in current_app.extensions["image_manifest"].items()
+        if source.startswith(prefix)
+    }
+
+
+def _attributes(attributes):
+    # Trailing underscores allow reserved words such as class_
+    return "".join(
+        f' {name.rstrip("_").replace("_", "-")}="{escape(value)}"'
+        for name, value in attributes.items()
+    )
+
+
+def picture(filename, sizes="100vw", **attributes):
+    """
+    Render an image with its variants as a <picture> element, so that the browser downloads the
+    best format it supports at the width it needs. The <picture> element does not generate a box,
+    so the styles of the page apply to the <img> as before.
+
+    :param filename: The path of the original image, relative to the static folder.
+    :param sizes: The `sizes` attribute: the width at which the image is displayed.
+    :param attributes: Attributes of the <img> element, such as alt.
+    :return: The HTML of the image.
+    """
+
+    image = f'<img src="{escape(url_for("static", filename=filename))}"{_attributes(attributes)} />'
+    sources = "".join(
+        f'<source type="{FORMATS[image_format]["mimetype"]}" '
+        f'srcset="{escape(srcset)}" sizes="{escape(sizes)}" />'
+        for image_format in FORMATS
+        if (srcset := image_srcset(filename, image_format))
+    )
+
+    if not sources:
+        return Markup(image)
+    return Markup(f'<picture style="display: contents">{sources}{image}</picture>')
+
+
+def _fingerprinted_static_url(endpoint, values):
+    if endpoint != "static" or current_app.debug:
+        return
+
+    entry = current_app.extensions["static_manifest"].get(values.get("filename"))
+    if entry is not None:
+        values["filename"] = entry["file"]
+
+
+def serve_static(filename):
+    """
+    View of the static files. The files built by `build_images` and `build_static` are cached by
+    the browsers for a year without being checked again, since a new version has a new name, and
+    the copies of the text files are sent compressed when the browser accepts it. Other files are
+    served by Flask as usual.
+
+    :param filename: The path of the file, relative to the static folder.
+    :return: The response with the file.
+    """
+
+    encodings = current_app.extensions["fingerprinted_files"].get(filename)
+    if encodings is None:
+        return current_app.send_static_file(filename)
+
+    encoding = next(
+        (encoding for encoding in encodings if request.accept_encodings[encoding] > 0), None
+    )
+    # The mimetype comes from the original name, not from the .br or .gz suffix
+    response = send_from_directory(
+        current_app.static_folder,
+        filename + ENCODINGS[encoding] if encoding else filename,
+        mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+        max_age=IMMUTABLE_MAX_AGE_SECS,
+    )
+    response.cache_control.immutable = True
+
+    if encodings:
+        response.vary.add("Accept-Encoding")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+
+    return response
+
+
+def init_app(app):
+    """
+    Load the image and static manifests, make the image helpers available to the templates and
+    serve the fingerprinted static files.
+
+    :param app: The Flask application.
+    :return: None
+    """
+
+    image_manifest = load_image_manifest(app.static_folder)
+    static_manifest = load_static_manifest(app.static_folder)
+
+    # Maps each file whose name contains a hash to the encodings it was compressed with
+    fingerprinted_files = {
+        variant["file"]: []
+        for entry in image_manifest.values()
+        for variants in entry["variants"].values()
+        for variant in variants
+    }
+    fingerprinted_files.update(
+        (entry["file"], entry["encodings"]) for entry in static_manifest.values()
+    )
+
+    app.extensions["image_manifest"] = image_manifest
+    app.extensions["static_manifest"] = static_manifest
+    app.extensions["fingerprinted_files"] = fingerprinted_files
+
+    app.add_template_global(picture)
+    app.add_template_global(image_srcset)
+    app.add_template_global(image_variants)
+
+    if "static" in app.view_functions:
+        app.url_defaults(_fingerprinted_static_url)
+        app.view_functions["static"] = serve_static
@@ -37,8 +37,8 @@ def login(email, password):
     """
 
     with db.session.begin():
-        user = user_service.validate_credentials(email, password, True)
-        session = session_service.create_session(user.id)
+        user = user_service.validate_credentials(email, password)
+        session = session_service.create_session(user.id, user.name, user.email)
         jwt = session_service.create_jwt(session.id, user.id, user.name, user.email)
         session_service.set_new_tokens(jwt, session.refresh_token)
 
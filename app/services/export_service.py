@@ -0,0 +1,172 @@
+"""
+This module exports users and sessions to CSV or JSON Lines, optionally compressed with gzip. Rows
+are streamed from the database in batches with `yield_per`, which uses a server-side cursor on the
+databases that support it, and written as they arrive, so the memory used does not depend on the
+size of the table. The rows are read from a read replica if one is configured. Secrets such as
+password hashes and refresh tokens are never exported.
+"""
+
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timezone
+
+from sqlalchemy import exists, select
+
+from app.database import replica_reads
+from app.extensions import db
+from app.models.session import Session
+from app.models.user import User
+from config import Config
+
+FORMATS = ("csv", "jsonl")
+
+_user_columns = (User.id, User.name, User.email, User.created_at)
+_session_columns = (
+    Session.id,
+    Session.user_id,
+    Session.created_at,
+    Session.updated_at,
+    Session.expires_at,
+)
+
+
+def detect_format(filename):
+    """
+    Detect the format of an output file and whether it is compressed from its extensions.
+
+    :param filename: The name of the file, such as "sessions.csv.gz".
+    :return: A tuple containing "csv" or "jsonl" and whether the file is compressed.
+    :raises ValueError: If the extension is not recognized.
+    """
+
+    name = filename.lower()
+    compressed = name.endswith(".gz")
+    name = name.removesuffix(".gz")
+
+    if name.endswith(".csv"):
+        return "csv", compressed
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl", compressed
+    raise ValueError(f"Cannot detect the format of {filename}. Use csv or jsonl.")
+
+
+def _serialize(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if value is None or isinstance(value, (int, float)):
+        return value
+    return str(value)
+
+
+def _write_rows(result, binary_stream, file_format, compress):
+    """
+    Write the rows of a streamed result to a binary stream and count them.
+    """
+
+    if compress:
+        binary_stream = gzip.GzipFile(fileobj=binary_stream, mode="wb")
+
+    stream = io.TextIOWrapper(binary_stream, encoding="utf-8", newline="")
+    columns = list(result.keys())
+    count = 0
+
+    try:
+        if file_format == "csv":
+            writer = csv.writer(stream)
+            writer.writerow(columns)
+
+            for row in result:
+                writer.writerow(["" if value is None else _serialize(value) for value in row])
+                count += 1
+        else:
+            for row in result:
+                stream.write(json.dumps(dict(zip(columns, map(_serialize, row)))) + "\n")
+                count += 1
+    finally:
+        stream.flush()
+        # Detach so that closing the wrapper does not close the caller's stream
+        stream.detach()
+        if compress:
+            binary_stream.close()
+
+    return count
+
+
+def _export(query, binary_stream, file_format, compress, batch_size):
+    with replica_reads(), db.session.begin():
+        result = db.session.execute(query.execution_options(yield_per=batch_size))
+        return _write_rows(result, binary_stream, file_format, compress)
+
+
+def export_users(
+    binary_stream,
+    file_format,
+    compress=False,
+    created_after=None,
+    active_only=False,
+    batch_size=1000,
+):
+    """
+    Export the id, name, email and creation time of users.
+
+    :param binary_stream: The binary stream to write to.
+    :param file_format: "csv" or "jsonl".
+    :param compress: If True, the output is compressed with gzip.
+    :param created_after: Optional datetime; only users created after it are exported. Users whose
+                          creation time is unknown are then skipped.
+    :param active_only: If True, only users with at least one unexpired session are exported.
+    :param batch_size: The number of rows fetched from the database at a time.
+    :return: The number of users exported.
+    """
+
+    query = select(*_user_columns).order_by(User.id)
+
+    if created_after is not None:
+        query = query.where(User.created_at > created_after)
+
+    if active_only:
+        query = query.where(
+            exists().where(
+                Session.user_id == User.id,
+                Session.expires_at > datetime.now(timezone.utc),
+            )
+        )
+
+    return _export(query, binary_stream, file_format, compress, batch_size)
+
+
+def export_sessions(
+    binary_stream,
+    file_format,
+    compress=False,
+    created_after=None,
+    active_only=False,
+    batch_size=1000,
+):
+    """
+    Export the id, user id and timestamps of sessions stored in the relational database.
+
+    :param binary_stream: The binary stream to write to.
+    :param file_format: "csv" or "jsonl".
+    :param compress: If True, the output is compressed with gzip.
+    :param created_after: Optional datetime; only sessions created after it are exported.
+    :param active_only: If True, only unexpired sessions are exported.
+    :param batch_size: The number of rows fetched from the database at a time.
+    :return: The number of sessions exported.
+    :raises ValueError: If the sessions are not kept in the relational database.
+    """
+
+    if Config.SESSION_STORE != "sql":
+        raise ValueError("Sessions can only be exported from the sql session store.")
+
+    query = select(*_session_columns).order_by(Session.id)
+
+    if created_after is not None:
+        query = query.where(Session.created_at > created_after)
+
+    if active_only:
+        query = query.where(Session.expires_at > datetime.now(timezone.utc))
+
+    return _export(query, binary_stream, file_format, compress, batch_size)
@@ -0,0 +1,48 @@
+"""
+This module gathers the runtime metrics of the services, such as cache hit rates, the database
+connection pool usage, the password process pool load and the rate limiter rejections, so that they
+can be exposed by the metrics endpoint.
+"""
+
+import hmac
+
+from app import database
+from app.exceptions import UnauthorizedException
+from app.extensions import db
+from config import Config
+
+from . import password_service, rate_limit_service, session_service, view_cache_service
+
+
+def authorize(authorization):
+    """
+    Check that the given Authorization header carries the metrics token. The metrics are disabled
+    when METRICS_TOKEN is not configured.
+
+    :param authorization: The value of the Authorization header of the request.
+    :return: None
+    :raises UnauthorizedException: If the metrics are disabled or the token does not match.
+    """
+
+    expected = f"Bearer {Config.METRICS_TOKEN}".encode()
+    # compare_digest only accepts ASCII strings, and the header may contain any character
+    given = (authorization or "").encode()
+
+    if not Config.METRICS_TOKEN or not hmac.compare_digest(given, expected):
+        raise UnauthorizedException()
+
+
+def collect():
+    """
+    Collect the current metrics of every service.
+
+    :return: A dictionary of metrics grouped by component.
+    """
+
+    return {
+        "database": database.get_pool_metrics(db.engine),
+        "jwt_cache": session_service.get_jwt_cache_stats(),
+        "password_hashing": password_service.get_metrics(),
+        "rate_limiting": rate_limit_service.get_metrics(),
+        "view_cache": view_cache_service.get_stats(),
+    }
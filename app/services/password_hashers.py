@@ -0,0 +1,228 @@
+"""
+This module provides the password hashers supported by the application and a registry to select
+them by name. The hasher used for new hashes is chosen with the PASSWORD_HASHER setting, while
+existing hashes are always verified by the hasher that produced them, so the algorithm and its
+parameters can change without invalidating stored passwords.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+import bcrypt
+
+from config import Config
+
+
+class PasswordHasher(ABC):
+    """
+    Base class for password hashers. Subclasses are constructed with their cost parameters and
+    registered in HASHERS under their name. The prefixes identify the hashes they produce.
+    """
+
+    name = ""
+    prefixes = ()
+
+    @abstractmethod
+    def hash(self, password) -> str:
+        """
+        Hash a password with the parameters of this hasher.
+
+        :param password: The password to hash.
+        :return: The hashed password as a string.
+        """
+
+    @abstractmethod
+    def verify(self, password, password_hash) -> bool:
+        """
+        Check if the provided password matches a hash produced by this algorithm.
+
+        :param password: The plain text password to check.
+        :param password_hash: The hashed password to compare against.
+        :return: True if the passwords match, False otherwise.
+        """
+
+    @classmethod
+    def identifies(cls, password_hash):
+        """
+        Check if the given hash was produced by this algorithm.
+
+        :param password_hash: The hashed password to inspect.
+        :return: True if this hasher can verify the hash, False otherwise.
+        """
+
+        return password_hash.startswith(cls.prefixes)
+
+    @abstractmethod
+    def needs_rehash(self, password_hash) -> bool:
+        """
+        Check if a hash produced by this algorithm uses parameters other than the ones of this
+        hasher.
+
+        :param password_hash: The hashed password to inspect.
+        :return: True if the password should be hashed again, False otherwise.
+        """
+
+
+class BcryptHasher(PasswordHasher):
+    """
+    bcrypt hasher. Its cost is the base 2 logarithm of the number of rounds.
+
+    :param rounds: The bcrypt cost factor, between 4 and 31.
+    """
+
+    name = "bcrypt"
+    prefixes = ("$2a$", "$2b$", "$2y$")
+
+    def __init__(self, rounds=12):
+        self.rounds = int(rounds)
+
+    def hash(self, password):
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(self.rounds)).decode()
+
+    def verify(self, password, password_hash):
+        return bcrypt.checkpw(password.encode(), password_hash.encode())
+
+    def needs_rehash(self, password_hash):
+        return int(password_hash.split("$")[2]) != self.rounds
+
+
+class Argon2idHasher(PasswordHasher):
+    """
+    Argon2id hasher. It requires the optional argon2-cffi package.
+
+    :param memory_cost: The memory used by each hash, in KiB.
+    :param time_cost: The number of passes over the memory.
+    :param parallelism: The number of parallel lanes.
+    :raises RuntimeError: If argon2-cffi is not installed.
+    """
+
+    name = "argon2id"
+    prefixes = ("$argon2id$",)
+
+    def __init__(self, memory_cost=65536, time_cost=3, parallelism=1):
+        try:
+            import argon2
+        except ImportError:
+            raise RuntimeError("The argon2id password hasher requires the argon2-cffi package.")
+
+        self._argon2 = argon2
+        self._hasher = argon2.PasswordHasher(
+            time_cost=int(time_cost),
+            memory_cost=int(memory_cost),
+            parallelism=int(parallelism),
+            type=argon2.Type.ID,
+        )
+
+    def hash(self, password):
+        return self._hasher.hash(password)
+
+    def verify(self, password, password_hash):
+        try:
+            return self._hasher.verify(password_hash, password)
+        except self._argon2.exceptions.VerificationError:
+            return False
+
+    def needs_rehash(self, password_hash):
+        return self._hasher.check_needs_rehash(password_hash)
+
+
+HASHERS = {hasher.name: hasher for hasher in (BcryptHasher, Argon2idHasher)}
+"""
+Registry of the supported password hashers by name.
+"""
+
+
+def configured_hasher_spec():
+    """
+    Retrieve the name and the parameters of the hasher configured for new hashes.
+
+    :return: A tuple containing the hasher name and a tuple of its (parameter, value) pairs.
+    :raises ValueError: If PASSWORD_HASHER is not a registered hasher.
+    """
+
+    if Config.PASSWORD_HASHER == "bcrypt":
+        return "bcrypt", (("rounds", Config.BCRYPT_LOG_ROUNDS),)
+
+    if Config.PASSWORD_HASHER == "argon2id":
+        return "argon2id", (
+            ("memory_cost", Config.ARGON2_MEMORY_COST),
+            ("time_cost", Config.ARGON2_TIME_COST),
+            ("parallelism", Config.ARGON2_PARALLELISM),
+        )
+
+    raise ValueError(f"Unknown password hasher: {Config.PASSWORD_HASHER}.")
+
+
+@lru_cache(maxsize=None)
+def get_hasher(name, params=()):
+    """
+    Retrieve a hasher by name with the given parameters. Hashers are cached, so repeated calls with
+    the same arguments return the same instance.
+
+    :param name: The name of the hasher in HASHERS.
+    :param params: A tuple of (parameter, value) pairs passed to the hasher.
+    :return: The hasher.
+    :raises ValueError: If the hasher is not registered.
+    """
+
+    if name not in HASHERS:
+        raise ValueError(f"Unknown password hasher: {name}.")
+    return HASHERS[name](**dict(params))
+
+
+def identify_hasher(password_hash):
+    """
+    Retrieve the name of the hasher able to verify the given hash.
+
+    :param password_hash: The hashed password to inspect.
+    :return: The name of the hasher that produced the hash.
+    :raises ValueError: If no registered hasher recognizes the hash.
+    """
+
+    for name, hasher in HASHERS.items():
+        if hasher.identifies(password_hash):
+            return name
+
+    raise ValueError("Unknown password hash format.")
+
+
+def calibrate(name, target_secs, **fixed_params):
+    """
+    Find the cost parameters of a hasher that bring the time of one hash on the current hardware as
+    close as possible to the target without exceeding it. bcrypt is tuned by its number of rounds
+    and argon2id by its time cost, with the memory cost and parallelism left fixed.
+
+    :param name: The name of the hasher to calibrate.
+    :param target_secs: The target time of one hash, in seconds.
+    :param fixed_params: Parameters of the hasher that are not tuned.
+    :return: A tuple containing the chosen parameters and a list of (parameters, seconds) for each
+             measurement taken.
+    :raises ValueError: If the hasher cannot be calibrated.
+    """
+
+    if name == "bcrypt":
+        tuned, start, stop = "rounds", 4, 31
+    elif name == "argon2id":
+        tuned, start, stop = "time_cost", 1, 100
+    else:
+        raise ValueError(f"Unknown password hasher: {name}.")
+
+    measurements = []
+    chosen = None
+
+    for cost in range(start, stop + 1):
+        params = {**fixed_params, tuned: cost}
+        hasher = HASHERS[name](**params)
+
+        started_at = time.perf_counter()
+        hasher.hash("calibration-password")
+        elapsed = time.perf_counter() - started_at
+
+        measurements.append((params, elapsed))
+
+        if elapsed > target_secs:
+            break
+        chosen = params
+
+    return chosen or measurements[0][0], measurements
@@ -0,0 +1,238 @@
+"""
+This module hashes and checks passwords in a dedicated process pool, so that a burst of logins
+cannot pin every request worker on password hashing. The number of operations waiting for or
+running in the pool is bounded. When the bound is reached, new operations fail fast with a 503
+response instead of queueing behind the others.
+"""
+
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from multiprocessing import get_context
+
+from app.exceptions import ServiceUnavailableException
+from config import Config
+
+from .password_hashers import configured_hasher_spec, get_hasher, identify_hasher
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(max(Config.PASSWORD_HASH_MAX_PENDING, 1))
+_metrics_lock = threading.Lock()
+_metrics = {
+    "pending": 0,
+    "completed": 0,
+    "rejected": 0,
+    "timed_out": 0,
+    "failed": 0,
+    "latency_total_secs": 0.0,
+    "latency_max_secs": 0.0,
+}
+
+
+def _hash(name, params, password):
+    return get_hasher(name, params).hash(password)
+
+
+def _check(name, password, password_hash):
+    return get_hasher(name).verify(password, password_hash)
+
+
+def _get_executor():
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # Spawned workers do not inherit the locks held by the threads of this process
+                _executor = ProcessPoolExecutor(
+                    max_workers=Config.PASSWORD_HASH_WORKERS,
+                    mp_context=get_context("spawn"),
+                )
+    return _executor
+
+
+def _discard_executor(executor):
+    global _executor
+
+    # A pool whose worker died cannot run anything else, so the next call starts a new one
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _record(name, value=1):
+    with _metrics_lock:
+        _metrics[name] += value
+
+
+def _release(future=None):
+    with _metrics_lock:
+        _metrics["pending"] -= 1
+    _slots.release()
+
+
+def _run(fn, *args):
+    """
+    Run a password function in the process pool, or inline if the pool is disabled. The call is
+    rejected if the pool already has PASSWORD_HASH_MAX_PENDING operations waiting or running. An
+    operation keeps its slot until it leaves the pool, even if the caller stopped waiting for it.
+    """
+
+    if Config.PASSWORD_HASH_WORKERS <= 0:
+        return fn(*args)
+
+    if not _slots.acquire(blocking=False):
+        _record("rejected")
+        raise ServiceUnavailableException(retry_after=Config.PASSWORD_HASH_RETRY_AFTER_SECS)
+
+    started_at = time.perf_counter()
+    _record("pending")
+    executor = _get_executor()
+
+    try:
+        future = executor.submit(fn, *args)
+    except BrokenProcessPool:
+        _release()
+        _record("failed")
+        _discard_executor(executor)
+        raise ServiceUnavailableException(retry_after=Config.PASSWORD_HASH_RETRY_AFTER_SECS)
+    except BaseException:
+        _release()
+        _record("failed")
+        raise
+
+    # Called when the operation finishes, fails or is cancelled, which may be after a timeout
+    future.add_done_callback(_release)
+
+    try:
+        result = future.result(Config.PASSWORD_HASH_TIMEOUT_SECS)
+    except FutureTimeoutError:
+        # Only an operation still waiting in the queue can be cancelled
+        future.cancel()
+        _record("timed_out")
+        raise ServiceUnavailableException(retry_after=Config.PASSWORD_HASH_RETRY_AFTER_SECS)
+    except BrokenProcessPool:
+        _record("failed")
+        _discard_executor(executor)
+        raise ServiceUnavailableException(retry_after=Config.PASSWORD_HASH_RETRY_AFTER_SECS)
+    except BaseException:
+        _record("failed")
+        raise
+
+    latency = time.perf_counter() - started_at
+
+    with _metrics_lock:
+        _metrics["completed"] += 1
+        _metrics["latency_total_secs"] += latency
+        _metrics["latency_max_secs"] = max(_metrics["latency_max_secs"], latency)
+
+    return result
+
+
+def hash_password(password):
+    """
+    Hash a password with the configured hasher in the password process pool.
+
+    :param password: The password to hash.
+    :return: The hashed password as a string.
+    :raises ServiceUnavailableException: If the pool is saturated or broken, or the operation
+                                         timed out.
+    """
+
+    name, params = configured_hasher_spec()
+    return _run(_hash, name, params, password)
+
+
+def hash_passwords(passwords, chunksize=16):
+    """
+    Hash many passwords with the configured hasher, spread across the password process pool. It is
+    meant for batch jobs such as imports: the calls are not subject to the admission limit of the
+    pool, so they should not be made while serving requests.
+
+    :param passwords: The passwords to hash.
+    :param chunksize: The number of passwords sent to a worker at once.
+    :return: The list of hashed passwords, in the order of the given passwords.
+    :raises RuntimeError: If a worker of the pool died while hashing the passwords.
+    """
+
+    name, params = configured_hasher_spec()
+    hash_one = partial(_hash, name, params)
+
+    if Config.PASSWORD_HASH_WORKERS <= 0:
+        return [hash_one(password) for password in passwords]
+
+    executor = _get_executor()
+
+    try:
+        return list(executor.map(hash_one, passwords, chunksize=chunksize))
+    except BrokenProcessPool as e:
+        _discard_executor(executor)
+        raise RuntimeError(
+            "A worker of the password pool died while hashing the passwords. The pool is "
+            "restarted on the next call."
+        ) from e
+
+
+def check_password(password, password_hash):
+    """
+    Check if the provided password matches the hashed password in the password process pool. The
+    hash is verified by the hasher that produced it, whatever the configured hasher is.
+
+    :param password: The plain text password to check.
+    :param password_hash: The hashed password to compare against.
+    :return: True if the passwords match, False otherwise.
+    :raises ServiceUnavailableException: If the pool is saturated or broken, or the operation
+                                         timed out.
+    """
+
+    try:
+        name = identify_hasher(password_hash)
+    except ValueError:
+        return False
+
+    return _run(_check, name, password, password_hash)
+
+
+def needs_rehash(password_hash):
+    """
+    Check if a hash was produced by another hasher or with other parameters than the configured
+    ones, in which case the password should be hashed again.
+
+    :param password_hash: The hashed password to inspect.
+    :return: True if the password should be hashed again, False otherwise.
+    """
+
+    name, params = configured_hasher_spec()
+
+    try:
+        if identify_hasher(password_hash) != name:
+            return True
+    except ValueError:
+        return True
+
+    return get_hasher(name, params).needs_rehash(password_hash)
+
+
+def get_metrics():
+    """
+    Retrieve the metrics of the password process pool: the number of operations waiting or
+    running, the number of completed, rejected, timed out and failed operations, and the latency
+    of the completed ones, including the time spent waiting in the queue.
+
+    :return: A dictionary with the pool metrics.
+    """
+
+    with _metrics_lock:
+        metrics = dict(_metrics)
+
+    metrics["workers"] = Config.PASSWORD_HASH_WORKERS
+    metrics["max_pending"] = Config.PASSWORD_HASH_MAX_PENDING
+    metrics["latency_avg_secs"] = (
+        metrics["latency_total_secs"] / metrics["completed"] if metrics["completed"] else 0.0
+    )
+    return metrics
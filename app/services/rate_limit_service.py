@@ -0,0 +1,90 @@
+"""
+This module throttles the login and registration attempts by client IP address and by email, with
+sliding window counters. Every attempt costs a password hashing operation, so the limits keep a
+credential stuffing script from exhausting the password process pool.
+"""
+
+import threading
+
+from app.exceptions import TooManyRequestsException
+from app.stores import get_rate_limit_store
+from config import Config
+
+_metrics_lock = threading.Lock()
+_metrics = {
+    "login": {"allowed": 0, "rejected": 0},
+    "register": {"allowed": 0, "rejected": 0},
+}
+
+
+def _limit(action, limits):
+    """
+    Count an attempt of the given action against every (key, limit) pair. Limits lower than 1 are
+    disabled.
+    """
+
+    limits = [(f"{action}:{key}", limit) for key, limit in limits if limit > 0]
+
+    if not limits:
+        return
+
+    allowed, retry_after = get_rate_limit_store().hit(limits, Config.RATE_LIMIT_WINDOW_SECS)
+
+    with _metrics_lock:
+        _metrics[action]["allowed" if allowed else "rejected"] += 1
+
+    if not allowed:
+        raise TooManyRequestsException(retry_after=retry_after)
+
+
+def limit_login(ip, email):
+    """
+    Count a login attempt from the given IP address for the given email.
+
+    :param ip: The IP address of the client.
+    :param email: The email the client tries to log in with.
+    :return: None
+    :raises TooManyRequestsException: If the IP address or the email has too many recent attempts.
+    """
+
+    _limit(
+        "login",
+        [
+            (f"ip:{ip}", Config.RATE_LIMIT_LOGIN_PER_IP),
+            (f"email:{email.strip().lower()}", Config.RATE_LIMIT_LOGIN_PER_EMAIL),
+        ],
+    )
+
+
+def limit_register(ip, email):
+    """
+    Count a registration attempt from the given IP address for the given email.
+
+    :param ip: The IP address of the client.
+    :param email: The email the client tries to register.
+    :return: None
+    :raises TooManyRequestsException: If the IP address or the email has too many recent attempts.
+    """
+
+    _limit(
+        "register",
+        [
+            (f"ip:{ip}", Config.RATE_LIMIT_REGISTER_PER_IP),
+            (f"email:{email.strip().lower()}", Config.RATE_LIMIT_REGISTER_PER_EMAIL),
+        ],
+    )
+
+
+def get_metrics():
+    """
+    Retrieve the number of allowed and rejected attempts of each action and the number of keys
+    tracked by the rate limit store.
+
+    :return: A dictionary with the rate limiting metrics.
+    """
+
+    with _metrics_lock:
+        metrics = {action: dict(counts) for action, counts in _metrics.items()}
+
+    metrics["keys"] = get_rate_limit_store().size()
+    return metrics
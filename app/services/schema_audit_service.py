@@ -0,0 +1,226 @@
+"""
+This module audits the indexes of the live database schema against the SQLAlchemy metadata of the
+models. It reports duplicate and redundant indexes, indexes declared by the models but missing from
+the database, foreign keys without a supporting index and, on PostgreSQL, indexes that have never
+been used.
+"""
+
+from dataclasses import dataclass
+
+from sqlalchemy import PrimaryKeyConstraint, UniqueConstraint, inspect, text
+
+from app.extensions import db
+
+
+@dataclass
+class AuditFinding:
+    """
+    A problem found by the schema audit.
+
+    :ivar kind: The kind of problem: "duplicate", "redundant", "missing", "unindexed-fk" or
+                "unused".
+    :ivar table: The table where the problem was found.
+    :ivar message: A description of the problem.
+    """
+
+    kind: str
+    table: str
+    message: str
+
+
+@dataclass
+class _IndexInfo:
+    name: str
+    columns: tuple
+    unique: bool
+
+
+def _live_indexes(inspector, table):
+    """
+    List the primary key, unique constraints and indexes of a table in the live database. Each of
+    them is backed by an index in the supported databases.
+    """
+
+    indexes = []
+
+    primary_key = inspector.get_pk_constraint(table)
+    if primary_key["constrained_columns"]:
+        indexes.append(
+            _IndexInfo(
+                primary_key["name"] or f"{table} primary key",
+                tuple(primary_key["constrained_columns"]),
+                True,
+            )
+        )
+
+    for constraint in inspector.get_unique_constraints(table):
+        indexes.append(
+            _IndexInfo(
+                constraint["name"] or f"unnamed unique constraint on {table}",
+                tuple(constraint["column_names"]),
+                True,
+            )
+        )
+
+    # Unique constraints are also reported as indexes by some dialects
+    constraint_names = {index.name for index in indexes}
+    for index in inspector.get_indexes(table):
+        if index["name"] not in constraint_names:
+            indexes.append(
+                _IndexInfo(index["name"], tuple(index["column_names"]), index["unique"])
+            )
+
+    return indexes
+
+
+def _declared_indexes(table):
+    """
+    List the primary key, unique constraints and indexes declared by the models for a table.
+    """
+
+    indexes = []
+
+    for constraint in table.constraints:
+        if isinstance(constraint, (PrimaryKeyConstraint, UniqueConstraint)) and constraint.columns:
+            indexes.append(
+                _IndexInfo(
+                    constraint.name or f"{type(constraint).__name__} on {table.name}",
+                    tuple(column.name for column in constraint.columns),
+                    True,
+                )
+            )
+
+    for index in table.indexes:
+        indexes.append(
+            _IndexInfo(
+                index.name,
+                tuple(column.name for column in index.columns),
+                bool(index.unique),
+            )
+        )
+
+    return indexes
+
+
+def _find_duplicates(table, indexes):
+    findings = []
+
+    for position, index in enumerate(indexes):
+        for other in indexes[position + 1 :]:
+            if index.columns == other.columns:
+                findings.append(
+                    AuditFinding(
+                        "duplicate",
+                        table,
+                        f"{index.name} and {other.name} both index {', '.join(index.columns)}.",
+                    )
+                )
+
+    for index in indexes:
+        if index.unique:
+            continue
+
+        for other in indexes:
+            if (
+                other is not index
+                and len(other.columns) > len(index.columns)
+                and other.columns[: len(index.columns)] == index.columns
+            ):
+                findings.append(
+                    AuditFinding(
+                        "redundant",
+                        table,
+                        f"{index.name} is a prefix of {other.name} ({', '.join(other.columns)}).",
+                    )
+                )
+                break
+
+    return findings
+
+
+def _find_missing(table, declared, live):
+    live_columns = {index.columns for index in live}
+
+    return [
+        AuditFinding(
+            "missing",
+            table,
+            f"{index.name} on {', '.join(index.columns)} is declared by the models but does not "
+            "exist in the database.",
+        )
+        for index in declared
+        if index.columns not in live_columns
+    ]
+
+
+def _find_unindexed_foreign_keys(inspector, table, live):
+    findings = []
+
+    for foreign_key in inspector.get_foreign_keys(table):
+        columns = tuple(foreign_key["constrained_columns"])
+
+        if not any(index.columns[: len(columns)] == columns for index in live):
+            findings.append(
+                AuditFinding(
+                    "unindexed-fk",
+                    table,
+                    f"Foreign key on {', '.join(columns)} referencing "
+                    f"{foreign_key['referred_table']} has no index starting with its columns.",
+                )
+            )
+
+    return findings
+
+
+def _find_unused(connection, tables):
+    """
+    Find non-unique indexes that have never been scanned since the statistics were last reset.
+    Only PostgreSQL keeps these statistics.
+    """
+
+    if connection.dialect.name != "postgresql":
+        return []
+
+    rows = connection.execute(
+        text(
+            "SELECT s.relname, s.indexrelname FROM pg_stat_user_indexes s "
+            "JOIN pg_index i ON i.indexrelid = s.indexrelid "
+            "WHERE s.idx_scan = 0 AND NOT i.indisunique"
+        )
+    )
+
+    return [
+        AuditFinding("unused", table, f"{index} has never been used by a query.")
+        for table, index in rows
+        if table in tables
+    ]
+
+
+def audit_schema():
+    """
+    Audit the indexes of every table declared by the models in the live database.
+
+    :return: A list of AuditFinding, empty if no problem was found.
+    """
+
+    findings = []
+
+    with db.engine.connect() as connection:
+        inspector = inspect(connection)
+        live_tables = set(inspector.get_table_names())
+
+        for table in db.metadata.sorted_tables:
+            if table.name not in live_tables:
+                findings.append(
+                    AuditFinding("missing", table.name, "The table does not exist in the database.")
+                )
+                continue
+
+            live = _live_indexes(inspector, table.name)
+            findings += _find_duplicates(table.name, live)
+            findings += _find_missing(table.name, _declared_indexes(table), live)
+            findings += _find_unindexed_foreign_keys(inspector, table.name, live)
+
+        findings += _find_unused(connection, set(db.metadata.tables))
+
+    return findings
@@ -4,65 +4,77 @@ and deleting sessions. It also handles JWT creation and decoding, session valida
 management for session tokens.
 """
 
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
 import jwt
 from flask import g, request
 
+from app.caching import SingleFlight, TTLCache
 from app.exceptions import SessionNotFoundException, UnauthorizedException
-from app.extensions import db
-from app.models.session import Session
+from app.stores import get_session_store
 from config import Config
 
+_jwt_cache = TTLCache(Config.JWT_CACHE_MAX_SIZE)
+"""
+Cache of verified JWT payloads keyed by the SHA-256 digest of the token. Each entry expires at the
+token's own "exp" claim, so a cached payload is never served for an expired token.
+"""
+
+_refresh_flight = SingleFlight()
+"""
+Deduplicates concurrent refreshes of the same refresh token within the process, so only one of
+them rotates the session while the others wait for its result.
+"""
+
+_refresh_grace = TTLCache(Config.REFRESH_GRACE_MAX_SIZE)
+"""
+Tokens issued by recent refreshes, with the ID of their session, keyed by the SHA-256 digest of the
+refresh token they replaced. Requests that still carry the previous refresh token during the grace
+period receive the same newly issued pair instead of failing, as long as the session still exists.
+"""
 
-def create_session(user_id):
+
+def create_session(user_id, name, email):
     """
     Create a new session for the given user. This function generates a new session with a unique
     refresh token and sets the expiration time based on the configuration.
 
     :param user_id: The ID of the user for whom the session is being created.
-    :return: The newly created session object.
+    :param name: The name of the user, used to issue access tokens for the session.
+    :param email: The email of the user, used to issue access tokens for the session.
+    :return: The newly created session.
     """
 
-    with db.session.begin_nested():
-        session = Session(user_id=user_id)  # type: ignore
-        db.session.add(session)
-    return session
+    return get_session_store().create(user_id, name, email)
 
 
-def get_session_by_id(session_id, inside_transaction=False):
+def get_session_by_id(session_id):
     """
-    Retrieve a session by its ID. If the session is found and not expired, it is returned. If the
-    session is expired, it is deleted.
+    Retrieve a session by its ID. If the session is found and not expired, it is returned. Expired
+    sessions are never returned and are eventually deleted by the sweeper.
 
     :param session_id: The ID of the session to retrieve.
-    :param inside_transaction: Whether the function is called within an existing transaction.
-    :return: The session object if found and not expired, otherwise None.
+    :return: The session if found and not expired, otherwise None.
     """
 
-    with db.session.begin_nested() if inside_transaction else db.session.begin():
-        session = Session.query.filter_by(id=session_id).with_for_update().first()
+    return get_session_store().get_by_id(session_id)
 
-        if session:
-            if not session.is_expired():
-                return session
-            delete_session(session)
 
-
-def get_session_by_id_or_raise(session_id, inside_transaction=False):
+def get_session_by_id_or_raise(session_id):
     """
     Retrieve a session by its ID and raise an exception if not found. This function is used to
     ensure that the session exists and is valid.
 
     :param session_id: The ID of the session to retrieve.
-    :param inside_transaction: Whether the function is called within an existing transaction.
-    :return: The session object if found and valid.
+    :return: The session if found and valid.
     :raises SessionNotFoundException: If the session with the given ID does not exist or is
                                       expired.
     """
 
-    session = get_session_by_id(session_id, inside_transaction)
+    session = get_session_by_id(session_id)
 
     if not session:
         raise SessionNotFoundException()
@@ -70,42 +82,30 @@ def get_session_by_id_or_raise(session_id, inside_transaction=False):
     return session
 
 
-def get_session_by_refresh_token(refresh_token, inside_transaction=False):
+def get_session_by_refresh_token(refresh_token):
     """
     Retrieve a session by its refresh token. If the session is found and not expired, it is
-    returned. If the session is expired, it is deleted.
+    returned. Expired sessions are never returned and are eventually deleted by the sweeper.
 
     :param refresh_token: The refresh token associated with the session.
-    :param inside_transaction: Whether the function is called within an existing transaction.
-    :return: The session object if found and not expired, otherwise None.
+    :return: The session if found and not expired, otherwise None.
     """
 
-    with db.session.begin_nested() if inside_transaction else db.session.begin():
-        session = (
-            Session.query.filter_by(refresh_token=refresh_token)
-            .with_for_update()
-            .first()
-        )
-
-        if session:
-            if not session.is_expired():
-                return session
-            delete_session(session)
+    return get_session_store().get_by_refresh_token(refresh_token)
 
 
-def get_session_by_refresh_token_or_raise(refresh_token, inside_transaction=False):
+def get_session_by_refresh_token_or_raise(refresh_token):
     """
     Retrieve a session by its refresh token and raise an exception if not found. This function is
     used to ensure that the session exists and is valid.
 
     :param refresh_token: The refresh token associated with the session.
-    :param inside_transaction: Whether the function is called within an existing transaction.
-    :return: The session object if found and valid.
+    :return: The session if found and valid.
     :raises SessionNotFoundException: If the session with the given refresh token does not exist or
                                       is expired.
     """
 
-    session = get_session_by_refresh_token(refresh_token, inside_transaction)
+    session = get_session_by_refresh_token(refresh_token)
 
     if not session:
         raise SessionNotFoundException()
@@ -136,42 +136,58 @@ def refresh_session(refresh_token):
     time. This function retrieves the session using the provided refresh token, updates its refresh
     token and expiration time, and returns a new JWT and refresh token.
 
+    Concurrent refreshes of the same refresh token are performed only once and every caller
+    receives the same new tokens. The previous refresh token also keeps returning those tokens for
+    REFRESH_GRACE_SECS seconds after the rotation.
+
     :param refresh_token: The refresh token used to retrieve the session.
     :return: A tuple containing the new JWT and refresh token.
     :raises SessionNotFoundException: If the session with the given refresh token does not exist or
                                       is expired.
     """
 
-    with db.session.begin():
-        session = get_session_by_refresh_token_or_raise(refresh_token, True)
-
-        session.refresh_token = Session.generate_refresh_token()
-        session.expires_at = Session.calculate_expiration()
-        session.updated_at = datetime.now(timezone.utc)
+    key = hashlib.sha256(refresh_token.encode()).digest()
+    entry = _refresh_grace.get(key)
 
-        db.session.add(session)
+    if entry is not None:
+        session_id, new_tokens = entry
 
-        jwt = create_jwt(
-            session.id,
-            session.user_id,
-            session.user.name,
-            session.user.email,
-        )
+        # The session may have been revoked since the rotation, by this worker or by another one
+        if get_session_store().get_by_id(session_id) is None:
+            _refresh_grace.delete(key)
+            raise SessionNotFoundException()
+        return new_tokens
 
-        return jwt, session.refresh_token
+    return _refresh_flight.do(key, lambda: rotate_session(refresh_token, key))
 
 
-def delete_session(session):
+def rotate_session(refresh_token, grace_key):
     """
-    Delete a session from the database. This function is used to remove a session when it is no
-    longer needed or has expired.
+    Rotate the refresh token of the session and extend its expiration time. The new tokens are
+    kept in the grace cache under the given key so that late requests with the previous refresh
+    token can reuse them.
 
-    :param session: The session object to be deleted.
-    :return: None
+    :param refresh_token: The refresh token used to retrieve the session.
+    :param grace_key: The key under which the new tokens are stored in the grace cache.
+    :return: A tuple containing the new JWT and refresh token.
+    :raises SessionNotFoundException: If the session with the given refresh token does not exist or
+                                      is expired.
     """
 
-    with db.session.begin_nested():
-        db.session.delete(session)
+    session = get_session_store().rotate(refresh_token)
+
+    if not session:
+        raise SessionNotFoundException()
+
+    new_tokens = (
+        create_jwt(session.id, session.user_id, session.name, session.email),
+        session.refresh_token,
+    )
+
+    _refresh_grace.set(
+        grace_key, (session.id, new_tokens), time.time() + Config.REFRESH_GRACE_SECS
+    )
+    return new_tokens
 
 
 def delete_session_by_id(session_id):
@@ -184,9 +200,45 @@ def delete_session_by_id(session_id):
     :raises SessionNotFoundException: If the session with the given ID does not exist.
     """
 
-    with db.session.begin():
-        session = get_session_by_id_or_raise(session_id, True)
-        delete_session(session)
+    if not get_session_store().delete(session_id):
+        raise SessionNotFoundException()
+
+
+def delete_user_sessions(user_id):
+    """
+    Delete every session of the given user. This function is used when the user account is deleted.
+
+    :param user_id: The ID of the user whose sessions are deleted.
+    :return: None
+    """
+
+    get_session_store().delete_user_sessions(user_id)
+
+
+def update_user_sessions(user_id, name, email):
+    """
+    Update the user information kept with the sessions of the given user, so that the access tokens
+    issued by the next refreshes carry the new name and email.
+
+    :param user_id: The ID of the user whose sessions are updated.
+    :param name: The new name of the user.
+    :param email: The new email of the user.
+    :return: None
+    """
+
+    get_session_store().update_user(user_id, name, email)
+
+
+def delete_expired_sessions(batch_size):
+    """
+    Delete up to `batch_size` expired sessions. The batch is bounded so that each call holds its
+    locks for a short time, even when a large number of sessions has expired.
+
+    :param batch_size: The maximum number of sessions to delete.
+    :return: The number of sessions deleted.
+    """
+
+    return get_session_store().delete_expired(batch_size)
 
 
 def create_jwt(session_id, user_id, name, email):
@@ -223,19 +275,42 @@ def decode_jwt(token):
     signature and extracts the session ID and user ID, converting them to UUIDs. If the token is
     expired or invalid, an UnauthorizedException is raised.
 
+    Verified payloads are cached until the token expires, so repeated requests with the same token
+    skip the signature verification. The returned payload is shared between callers and must not
+    be modified.
+
     :param token: The JWT to decode.
     :return: The decoded payload containing session and user information.
     :raises UnauthorizedException: If the token is expired or invalid.
     """
 
+    cache_key = hashlib.sha256(token.encode()).digest()
+    payload = _jwt_cache.get(cache_key)
+
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=["HS256"])
         payload["data"]["session_id"] = UUID(payload["data"]["session_id"])
         payload["data"]["user_id"] = UUID(payload["data"]["user_id"])
-        return payload
     except (jwt.ExpiredSignatureError, jwt.InvalidTokenError):
         raise UnauthorizedException()
 
+    if "exp" in payload:
+        _jwt_cache.set(cache_key, payload, payload["exp"])
+    return payload
+
+
+def get_jwt_cache_stats():
+    """
+    Retrieve the counters of the verified JWT cache, which can be used to monitor its hit rate.
+
+    :return: A dictionary with the cache size, max size, hits and misses.
+    """
+
+    return _jwt_cache.stats()
+
 
 def set_new_tokens(access_token, refresh_token):
     """
@@ -332,8 +407,8 @@ def set_current_session(access_token=None, refresh_token=None):
 
         g.session_id = session.id
         g.user_id = session.user_id
-        g.name = session.user.name
-        g.email = session.user.email
+        g.name = session.name
+        g.email = session.email
 
 
 def extract_session_from_request():
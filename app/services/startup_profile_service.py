@@ -0,0 +1,124 @@
+"""
+This module measures how long the application takes to start. The application is created in a
+fresh interpreter, the way a WSGI server creates it, so that nothing is already imported. The time
+spent importing each package is taken from `python -X importtime`, and the time of each phase of
+`create_app` from the timings it records.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_PROFILE_SCRIPT = """
+import json
+import time
+
+started = time.perf_counter()
+
+from app import create_app
+
+app = create_app()
+total_ms = (time.perf_counter() - started) * 1000
+print(json.dumps({"total_ms": total_ms, "phases": app.extensions["startup_timings"]}))
+"""
+
+
+@dataclass
+class StartupProfile:
+    """
+    The measurements of one start of the application.
+
+    :ivar total_ms: The time from the import of the application package until `create_app`
+                    returns, in milliseconds.
+    :ivar phases: A list of (phase, milliseconds) tuples for the phases of `create_app`, imports
+                  included.
+    :ivar imports: A list of (package, milliseconds) tuples with the time spent importing the
+                   modules of each package, slowest first. The modules of the application are
+                   grouped by subpackage.
+    """
+
+    total_ms: float
+    phases: list = field(default_factory=list)
+    imports: list = field(default_factory=list)
+
+    @property
+    def import_ms(self):
+        """
+        The total time spent importing modules, in milliseconds.
+        """
+
+        return sum(ms for _, ms in self.imports)
+
+
+def _package_of(module):
+    parts = module.split(".")
+    # The application is split by subpackage, everything else by top-level package
+    return ".".join(parts[:2]) if parts[0] == "app" else parts[0]
+
+
+def parse_import_times(output):
+    """
+    Add up the self time of the modules of each package from the output of `python -X importtime`.
+
+    :param output: The standard error of the interpreter.
+    :return: A list of (package, milliseconds) tuples, slowest first.
+    """
+
+    totals = {}
+
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        self_us, _, module = line.removeprefix("import time:").split("|")
+        if not self_us.strip().isdigit():
+            # Header line
+            continue
+
+        package = _package_of(module.strip())
+        totals[package] = totals.get(package, 0) + int(self_us) / 1000
+
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def profile_startup_once():
+    """
+    Start the application once in a new interpreter and measure it.
+
+    :return: The StartupProfile of the start.
+    :raises RuntimeError: If the application fails to start.
+    """
+
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROFILE_SCRIPT],
+        cwd=_PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+
+    if process.returncode != 0:
+        raise RuntimeError(f"The application failed to start:\n{process.stderr[-2000:]}")
+
+    result = json.loads(process.stdout.strip().splitlines()[-1])
+    return StartupProfile(
+        result["total_ms"],
+        [tuple(phase) for phase in result["phases"]],
+        parse_import_times(process.stderr),
+    )
+
+
+def profile_startup(runs=3):
+    """
+    Start the application several times and keep the fastest start, which is the least affected
+    by other load on the machine.
+
+    :param runs: The number of starts.
+    :return: The StartupProfile of the fastest start.
+    :raises RuntimeError: If the application fails to start.
+    """
+
+    return min((profile_startup_once() for _ in range(runs)), key=lambda profile: profile.total_ms)
@@ -0,0 +1,110 @@
+"""
+This module provides the expired session sweeper, which deletes expired sessions in bounded
+batches. The sweeper can run once, through the `flask sessions sweep` command, or periodically in a
+background thread of the application process.
+"""
+
+import logging
+import threading
+import time
+
+from config import Config
+
+from . import session_service
+
+logger = logging.getLogger(__name__)
+
+_sweeper_thread = None
+_sweeper_stop = threading.Event()
+
+
+def sweep_expired_sessions(batch_size=None, rate=None, max_batches=None, on_progress=None):
+    """
+    Delete expired sessions in batches until no expired session is left or the maximum number of
+    batches is reached. The pace of the deletes is limited to `rate` batches per second to keep the
+    load on the database predictable.
+
+    :param batch_size: The maximum number of sessions deleted per batch. Defaults to
+                       SESSION_SWEEP_BATCH_SIZE.
+    :param rate: The maximum number of batches per second, or 0 for no limit. Defaults to
+                 SESSION_SWEEP_RATE.
+    :param max_batches: The maximum number of batches to run, or None for no limit.
+    :param on_progress: Optional callback called after each batch with the batch number, the
+                        number of sessions deleted in the batch and the total deleted so far.
+    :return: The total number of sessions deleted.
+    """
+
+    batch_size = batch_size or Config.SESSION_SWEEP_BATCH_SIZE
+    rate = Config.SESSION_SWEEP_RATE if rate is None else rate
+    total = 0
+    batch = 0
+
+    while max_batches is None or batch < max_batches:
+        deleted = session_service.delete_expired_sessions(batch_size)
+        batch += 1
+        total += deleted
+
+        if on_progress:
+            on_progress(batch, deleted, total)
+
+        if deleted < batch_size:
+            break
+
+        if rate > 0:
+            time.sleep(1 / rate)
+
+    return total
+
+
+def start_sweeper(app, interval=None):
+    """
+    Start a daemon thread that sweeps expired sessions every `interval` seconds. Calling this
+    function while the sweeper is already running has no effect.
+
+    :param app: The Flask application used to create the application context for each sweep.
+    :param interval: The number of seconds between sweeps. Defaults to
+                     SESSION_SWEEP_INTERVAL_SECS.
+    :return: None
+    """
+
+    global _sweeper_thread
+
+    if _sweeper_thread is not None and _sweeper_thread.is_alive():
+        return
+
+    _sweeper_stop.clear()
+    _sweeper_thread = threading.Thread(
+        target=_run_sweeper,
+        args=(app, interval or Config.SESSION_SWEEP_INTERVAL_SECS),
+        name="session-sweeper",
+        daemon=True,
+    )
+    _sweeper_thread.start()
+
+
+def stop_sweeper():
+    """
+    Stop the background sweeper thread, if it is running, and wait for it to finish.
+
+    :return: None
+    """
+
+    global _sweeper_thread
+
+    _sweeper_stop.set()
+
+    if _sweeper_thread is not None:
+        _sweeper_thread.join()
+        _sweeper_thread = None
+
+
+def _run_sweeper(app, interval):
+    while not _sweeper_stop.wait(interval):
+        try:
+            with app.app_context():
+                total = sweep_expired_sessions()
+
+            if total:
+                logger.info("Swept %d expired sessions.", total)
+        except Exception:
+            logger.exception("Failed to sweep expired sessions.")
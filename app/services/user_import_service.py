@@ -0,0 +1,224 @@
+"""
+This module imports users in bulk from CSV or JSON Lines files, such as a whole class of students
+at once. Rows are streamed and validated with the registration schema, the passwords of each batch
+are hashed across the password process pool and the valid rows are written with multi-row INSERTs,
+one transaction per batch.
+"""
+
+import csv
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+
+from marshmallow import EXCLUDE, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.user import User
+
+from . import password_service
+
+FORMATS = ("csv", "jsonl")
+
+
+@dataclass
+class ImportRowError:
+    """
+    A row that could not be imported.
+
+    :ivar line: The line number of the row in the input file.
+    :ivar email: The email of the row, if it has one.
+    :ivar message: A description of the problem.
+    """
+
+    line: int
+    email: str
+    message: str
+
+
+@dataclass
+class ImportResult:
+    """
+    The outcome of an import.
+
+    :ivar imported: The number of users created.
+    :ivar errors: The rows that could not be imported.
+    """
+
+    imported: int = 0
+    errors: list = field(default_factory=list)
+
+
+def detect_format(filename):
+    """
+    Detect the format of an input file from its extension.
+
+    :param filename: The name of the file.
+    :return: "csv" or "jsonl".
+    :raises ValueError: If the extension is not recognized.
+    """
+
+    extension = filename.rsplit(".", 1)[-1].lower()
+
+    if extension == "csv":
+        return "csv"
+    if extension in ("jsonl", "ndjson"):
+        return "jsonl"
+    raise ValueError(f"Cannot detect the format of {filename}. Use csv or jsonl.")
+
+
+def read_rows(stream, file_format):
+    """
+    Read the rows of a CSV file with a header or of a JSON Lines file, one at a time.
+
+    :param stream: A text stream with the file content.
+    :param file_format: "csv" or "jsonl".
+    :return: A generator of (line number, row) tuples. Rows that cannot be parsed are yielded as
+             ImportRowError instead of a dictionary.
+    """
+
+    if file_format == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line, text in enumerate(stream, start=1):
+        if not text.strip():
+            continue
+
+        try:
+            row = json.loads(text)
+        except ValueError:
+            yield line, ImportRowError(line, "", "JSON inválido.")
+            continue
+
+        if not isinstance(row, dict):
+            yield line, ImportRowError(line, "", "A linha deve conter um objeto JSON.")
+            continue
+
+        yield line, row
+
+
+def _format_validation_error(error):
+    messages = []
+
+    for name, field_messages in error.normalized_messages().items():
+        if isinstance(field_messages, dict):
+            field_messages = [str(field_messages)]
+        messages.append(f"{name}: {' '.join(field_messages)}")
+
+    return "; ".join(messages)
+
+
+def _existing_emails(normalized_emails):
+    return set(
+        db.session.scalars(
+            select(User.email_normalized).where(User.email_normalized.in_(normalized_emails))
+        )
+    )
+
+
+def _insert_batch(lines, users, result):
+    """
+    Insert a batch of users in a single transaction. If a concurrent registration took one of the
+    emails in the meantime, the batch is inserted again one user at a time to find it.
+    """
+
+    try:
+        with db.session.begin():
+            db.session.execute(insert(User), users)
+        result.imported += len(users)
+        return
+    except IntegrityError:
+        pass
+
+    for line, user in zip(lines, users):
+        try:
+            with db.session.begin():
+                db.session.execute(insert(User), [user])
+            result.imported += 1
+        except IntegrityError:
+            result.errors.append(ImportRowError(line, user["email"], "E-mail já está em uso."))
+
+
+def import_users(rows, batch_size=1000, on_batch=None):
+    """
+    Validate and create users from the given rows. Columns other than the ones of the registration
+    schema are ignored. Invalid rows, emails already in use and emails repeated in the input,
+    regardless of case, are reported as errors without stopping the import.
+
+    :param rows: An iterable of (line number, row) tuples, as returned by `read_rows`.
+    :param batch_size: The number of rows validated, hashed and inserted together.
+    :param on_batch: Optional callback called after each batch with the ImportResult so far.
+    :return: The ImportResult of the import.
+    :raises RuntimeError: If the passwords of a batch could not be hashed. The batches before it
+                          are already imported.
+    """
+
+    from app.controllers.api.schemas.auth_schemas import register_schema
+
+    result = ImportResult()
+    seen_emails = set()
+    rows = iter(rows)
+
+    while batch := list(islice(rows, batch_size)):
+        valid = []
+
+        for line, row in batch:
+            if isinstance(row, ImportRowError):
+                result.errors.append(row)
+                continue
+
+            try:
+                data = register_schema.load(row, unknown=EXCLUDE)
+            except ValidationError as e:
+                result.errors.append(
+                    ImportRowError(line, str(row.get("email", "")), _format_validation_error(e))
+                )
+                continue
+
+            data["email_normalized"] = User.normalize_email(data["email"])  # type: ignore
+
+            if data["email_normalized"] in seen_emails:  # type: ignore
+                result.errors.append(
+                    ImportRowError(line, data["email"], "E-mail repetido no arquivo.")  # type: ignore
+                )
+                continue
+
+            seen_emails.add(data["email_normalized"])  # type: ignore
+            valid.append((line, data))
+
+        if valid:
+            with db.session.begin():
+                existing = _existing_emails([data["email_normalized"] for _, data in valid])
+
+            for line, data in valid:
+                if data["email_normalized"] in existing:
+                    result.errors.append(
+                        ImportRowError(line, data["email"], "E-mail já está em uso.")
+                    )
+
+            valid = [
+                (line, data) for line, data in valid if data["email_normalized"] not in existing
+            ]
+
+        if valid:
+            hashes = password_service.hash_passwords([data["password"] for _, data in valid])
+            users = [
+                {
+                    "name": data["name"],
+                    "email": data["email"],
+                    "email_normalized": data["email_normalized"],
+                    "password_hash": password_hash,
+                }
+                for (_, data), password_hash in zip(valid, hashes)
+            ]
+            _insert_batch([line for line, _ in valid], users, result)
+
+        if on_batch:
+            on_batch(result)
+
+    result.errors.sort(key=lambda error: error.line)
+    return result
@@ -1,65 +1,80 @@
 """
 This module provides services related to user management, including creating users, validating
-credentials, and managing user data.
+credentials, and managing user data. Users are read without locks. Updates rely on the version
+column of the users table instead, so a concurrent modification makes the update fail with a
+ConcurrentModificationException rather than blocking the readers.
 """
 
+from contextlib import contextmanager
+
 from flask import g
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.exceptions import (
+    ConcurrentModificationException,
     EmailAlreadyInUseException,
     InvalidCredentialsException,
+    ServiceUnavailableException,
     UnauthorizedException,
     UserNotFoundException,
 )
-from app.extensions import bcrypt, db
+from app.extensions import db
 from app.models.user import User
 
+from . import password_service, session_service
 
-def user_exists(email, for_update=False):
-    """
-    Check if a user with the given email exists in the database. If `for_update` is True, the query
-    will lock the row for update.
 
-    :param email: The email of the user to check.
-    :param for_update: If True, locks the row for update.
-    :return: True if the user exists, False otherwise.
+@contextmanager
+def optimistic_transaction():
     """
+    Begin a transaction whose updates of versioned rows are checked against the versions that were
+    read. If another transaction modified one of the rows in the meantime, the transaction is rolled
+    back.
 
-    query = User.query.filter_by(email=email)
-
-    if for_update:
-        query = query.with_for_update()
+    :raises ConcurrentModificationException: If a row was modified by another transaction.
+    """
 
-    return query.first() is not None
+    try:
+        with db.session.begin():
+            yield
+    except StaleDataError:
+        raise ConcurrentModificationException()
 
 
 def hash_password(password):
     """
-    Hash a password using bcrypt.
+    Hash a password with the configured hasher. The work runs in the password process pool.
 
     :param password: The password to hash.
     :return: The hashed password as a string.
+    :raises ServiceUnavailableException: If the password process pool is saturated.
     """
 
-    return bcrypt.generate_password_hash(password).decode()
+    return password_service.hash_password(password)
 
 
 def check_password(password, password_hash):
     """
-    Check if the provided password matches the hashed password.
+    Check if the provided password matches the hashed password. The work runs in the password
+    process pool.
 
     :param password: The plain text password to check.
     :param password_hash: The hashed password to compare against.
     :return: True if the passwords match, False otherwise.
+    :raises ServiceUnavailableException: If the password process pool is saturated.
     """
 
-    return bcrypt.check_password_hash(password_hash, password)
+    return password_service.check_password(password, password_hash)
 
 
 def create_user(name, email, password):
     """
-    Create a new user with the given name, email, and password. If a user with the given email
-    already exists, an EmailAlreadyInUseException is raised.
+    Create a new user with the given name, email, and password. The user is inserted in a single
+    statement and the unique index on the normalized email rejects duplicates, even when two
+    registrations with the same email run concurrently. If a user with the given email already
+    exists, an EmailAlreadyInUseException is raised.
 
     :param name: The name of the user.
     :param email: The email of the user.
@@ -68,42 +83,37 @@ def create_user(name, email, password):
     :raises EmailAlreadyInUseException: If a user with the given email already exists.
     """
 
-    with db.session.begin():
-        if user_exists(email, True):
-            raise EmailAlreadyInUseException()
+    password_hash = hash_password(password)
 
-        user = User(name=name, email=email, password_hash=hash_password(password))  # type: ignore
-        db.session.add(user)
+    try:
+        with db.session.begin():
+            user = User(name=name, email=email, password_hash=password_hash)  # type: ignore
+            db.session.add(user)
+    except IntegrityError:
+        raise EmailAlreadyInUseException()
 
 
-def get_user_by_id(user_id, for_update=False):
+def get_user_by_id(user_id):
     """
-    Retrieve a user by their ID. If `for_update` is True, the query will lock the row for update.
+    Retrieve a user by their ID.
 
     :param user_id: The ID of the user to retrieve.
-    :param for_update: If True, locks the row for update.
     :return: The User object if found, None otherwise.
     """
 
-    query = User.query.filter_by(id=user_id)
+    return User.query.filter_by(id=user_id).first()
 
-    if for_update:
-        query = query.with_for_update()
 
-    return query.first()
-
-
-def get_user_by_id_or_raise(user_id, for_update=False):
+def get_user_by_id_or_raise(user_id):
     """
     Retrieve a user by their ID and raise an exception if the user is not found.
 
     :param user_id: The ID of the user to retrieve.
-    :param for_update: If True, locks the row for update.
     :return: The User object if found.
     :raises UserNotFoundException: If the user with the given ID does not exist.
     """
 
-    user = get_user_by_id(user_id, for_update)
+    user = get_user_by_id(user_id)
 
     if not user:
         raise UserNotFoundException()
@@ -111,35 +121,27 @@ def get_user_by_id_or_raise(user_id, for_update=False):
     return user
 
 
-def get_user_by_email(email, for_update=False):
+def get_user_by_email(email):
     """
-    Retrieve a user by their email. If `for_update` is True, the query will lock the row for
-    update.
+    Retrieve a user by their email. Emails are compared regardless of case and surrounding spaces.
 
     :param email: The email of the user to retrieve.
-    :param for_update: If True, locks the row for update.
     :return: The User object if found, None otherwise.
     """
 
-    query = User.query.filter_by(email=email)
-
-    if for_update:
-        query = query.with_for_update()
+    return User.query.filter_by(email_normalized=User.normalize_email(email)).first()
 
-    return query.first()
 
-
-def get_user_by_email_or_raise(email, for_update=False):
+def get_user_by_email_or_raise(email):
     """
     Retrieve a user by their email and raise an exception if the user is not found.
 
     :param email: The email of the user to retrieve.
-    :param for_update: If True, locks the row for update.
     :return: The User object if found.
     :raises UserNotFoundException: If the user with the given email does not exist.
     """
 
-    user = get_user_by_email(email, for_update)
+    user = get_user_by_email(email)
 
     if not user:
         raise UserNotFoundException()
@@ -147,28 +149,58 @@ def get_user_by_email_or_raise(email, for_update=False):
     return user
 
 
-def validate_credentials(email, password, for_update=False):
+def validate_credentials(email, password):
     """
     Validate user credentials by checking if the user exists and if the provided password matches
     the stored password hash. If the user does not exist or the password is incorrect, an
-    InvalidCredentialsException is raised.
+    InvalidCredentialsException is raised. If the stored hash uses outdated hashing parameters, the
+    password is hashed again with the configured ones, to be saved with the caller's transaction.
 
     :param email: The email of the user to validate.
     :param password: The password to validate.
-    :param for_update: If True, locks the row for update.
     :return: The User object if credentials are valid.
     :raises InvalidCredentialsException: If the credentials are invalid.
     """
 
     try:
-        user = get_user_by_email_or_raise(email, for_update)
+        user = get_user_by_email_or_raise(email)
         if check_password(password, user.password_hash):
+            rehash_password_if_needed(user, password)
             return user
     except UserNotFoundException:
         pass
     raise InvalidCredentialsException()
 
 
+def rehash_password_if_needed(user, password):
+    """
+    Hash the user's password again if the stored hash was produced by another hasher or with other
+    parameters than the configured ones. The new hash only replaces the hash that was verified, so
+    a concurrent login or password change is never overwritten and never makes this login fail. The
+    rehash is also skipped if the password process pool is saturated; it is retried on the next
+    login.
+
+    :param user: The User object whose password was just verified.
+    :param password: The plain text password of the user.
+    :return: None
+    """
+
+    if not password_service.needs_rehash(user.password_hash):
+        return
+
+    try:
+        password_hash = hash_password(password)
+    except ServiceUnavailableException:
+        return
+
+    db.session.execute(
+        update(User)
+        .where(User.id == user.id, User.password_hash == user.password_hash)
+        .values(password_hash=password_hash, version=User.version + 1),
+        execution_options={"synchronize_session": False},
+    )
+
+
 def get_current_user():
     """
     Retrieve the current user from the Flask global context. The user information is expected to be
@@ -189,10 +221,10 @@ def get_current_user():
     return user
 
 
-def fetch_and_lock_current_user():
+def fetch_current_user():
     """
-    Fetch the current user from the database and lock the row for update. This is useful for
-    ensuring that the user data is not modified by another transaction while it is being updated.
+    Fetch the current user from the database. The row is not locked: updates of the returned user
+    are checked against its version when the transaction is committed.
 
     :return: The User object representing the current user.
     :raises UnauthorizedException: If the current user cannot be determined.
@@ -200,32 +232,36 @@ def fetch_and_lock_current_user():
 
     try:
         user_id = get_current_user()["id"]
-        return get_user_by_id_or_raise(user_id, True)
+        return get_user_by_id_or_raise(user_id)
     except UserNotFoundException:
         raise UnauthorizedException()
 
 
 def update_current_user_name(name):
     """
-    Update the name of the current user. The user's row is locked for update to prevent concurrent
-    modifications.
+    Update the name of the current user. The update fails if the user was modified concurrently.
 
     :param name: The new name for the user.
     :return: None
     :raises UnauthorizedException: If the current user cannot be determined.
+    :raises ConcurrentModificationException: If the user was modified by another request.
     """
 
-    with db.session.begin():
-        user = fetch_and_lock_current_user()
+    with optimistic_transaction():
+        user = fetch_current_user()
         user.name = name
         db.session.add(user)
+        user_id, email = user.id, user.email
+
+    # The sessions are only updated once the new name is committed
+    session_service.update_user_sessions(user_id, name, email)
 
 
 def update_current_user_email(email):
     """
-    Update the email of the current user. If a user with the given email already exists, an
-    EmailAlreadyInUseException is raised. The user's row is locked for update to prevent concurrent
-    modifications.
+    Update the email of the current user in a single UPDATE statement, relying on the unique index
+    on the normalized email to reject duplicates, including emails that only differ by case. If a
+    user with the given email already exists, an EmailAlreadyInUseException is raised.
 
     :param email: The new email for the user.
     :return: None
@@ -233,32 +269,50 @@ def update_current_user_email(email):
     :raises EmailAlreadyInUseException: If a user with the given email already exists.
     """
 
-    with db.session.begin():
-        user = fetch_and_lock_current_user()
+    user_id = get_current_user()["id"]
+    statement = (
+        update(User)
+        .where(User.id == user_id)
+        .values(
+            email=email,
+            email_normalized=User.normalize_email(email),
+            version=User.version + 1,
+        )
+        .returning(User.name)
+    )
+
+    try:
+        with db.session.begin():
+            name = db.session.execute(
+                statement, execution_options={"synchronize_session": False}
+            ).scalar()
 
-        if user_exists(email, True):
-            raise EmailAlreadyInUseException()
+            if name is None:
+                raise UnauthorizedException()
+    except IntegrityError:
+        raise EmailAlreadyInUseException()
 
-        user.email = email
-        db.session.add(user)
+    # The sessions are only updated once the new email is committed
+    session_service.update_user_sessions(user_id, name, email)
 
 
 def update_current_user_password(current_password, new_password):
     """
-    Update the password of the current user. The user's row is locked for update to prevent
-    concurrent modifications. If the current password does not match the stored password hash, an
+    Update the password of the current user. The update fails if the user was modified
+    concurrently. If the current password does not match the stored password hash, an
     InvalidCredentialsException is raised.
 
     :param current_password: The current password of the user.
     :param new_password: The new password for the user.
     :return: None
     :raises UnauthorizedException: If the current user cannot be determined.
+    :raises ConcurrentModificationException: If the user was modified by another request.
     :raises InvalidCredentialsException: If the current password does not match the stored password
                                          hash.
     """
 
-    with db.session.begin():
-        user = fetch_and_lock_current_user()
+    with optimistic_transaction():
+        user = fetch_current_user()
 
         if not check_password(current_password, user.password_hash):
             raise InvalidCredentialsException()
@@ -269,21 +323,26 @@ def update_current_user_password(current_password, new_password):
 
 def delete_current_user(password):
     """
-    Delete the current user from the database. The user's row is locked for update to prevent
-    concurrent modifications. If the provided password does not match the stored password hash, an
+    Delete the current user from the database. The deletion fails if the user was modified
+    concurrently. If the provided password does not match the stored password hash, an
     InvalidCredentialsException is raised.
 
     :param password: The password of the user to confirm deletion.
     :return: None
     :raises UnauthorizedException: If the current user cannot be determined.
+    :raises ConcurrentModificationException: If the user was modified by another request.
     :raises InvalidCredentialsException: If the provided password does not match the stored
                                          password hash.
     """
 
-    with db.session.begin():
-        user = fetch_and_lock_current_user()
+    with optimistic_transaction():
+        user = fetch_current_user()
 
         if not check_password(password, user.password_hash):
             raise InvalidCredentialsException()
 
+        user_id = user.id
         db.session.delete(user)
+
+    # The sessions are only revoked once the deletion is committed
+    session_service.delete_user_sessions(user_id)
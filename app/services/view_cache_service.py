@@ -0,0 +1,93 @@
+"""
+This module caches the rendered responses of the views. Most pages only depend on `url_for`, and the
+account page on the name and email of the user, which come from the access token, so the HTML is
+rendered once and reused. Every cached response carries a strong ETag computed from its body, and a
+request whose If-None-Match matches it gets a 304 response without a body.
+
+The cache lives in the memory of each worker, so it starts empty after every deploy, and since the
+ETag is derived from the content, ETags from a previous version never match a changed page. Pages
+that depend on the user are cached under a fingerprint of the claims of the access token: when the
+name or email changes, the new access token has new claims and the page is rendered again, while the
+old entry is evicted as the cache fills up or expires. Entries are therefore never invalidated
+explicitly: an update only has to change the claims of the token, which works across workers.
+"""
+
+import hashlib
+import time
+from functools import wraps
+
+from flask import current_app, request
+
+from app.caching import SingleFlight, TTLCache
+from config import Config
+
+from . import user_service
+
+_view_cache = TTLCache(Config.VIEW_CACHE_MAX_SIZE)
+_renders = SingleFlight()
+
+
+def _user_fingerprint():
+    user = user_service.get_current_user()
+    claims = "\0".join(str(user[name]) for name in ("id", "name", "email"))
+    return hashlib.sha256(claims.encode()).hexdigest()
+
+
+def _render(view, args, kwargs):
+    response = current_app.make_response(view(*args, **kwargs))
+    body = response.get_data()
+    return body, response.status_code, response.mimetype, hashlib.sha256(body).hexdigest()[:32]
+
+
+def cached_view(vary_args=(), per_user=False):
+    """
+    Decorator that caches the response of a view. The cache is bypassed in debug mode, where the
+    templates are reloaded when they change. Concurrent requests for a page that is not cached yet
+    share a single render.
+
+    :param vary_args: The names of the query string arguments the page depends on. Other arguments
+                      are ignored.
+    :param per_user: If True, the page depends on the current user. It is cached per user and marked
+                     as private.
+    :return: The decorated view.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if current_app.debug or Config.VIEW_CACHE_MAX_SIZE <= 0:
+                return view(*args, **kwargs)
+
+            key = (
+                request.endpoint,
+                tuple(request.args.get(name) for name in vary_args),
+                _user_fingerprint() if per_user else None,
+            )
+            entry = _view_cache.get(key)
+
+            if entry is None:
+                entry = _renders.do(key, lambda: _render(view, args, kwargs))
+                _view_cache.set(key, entry, time.time() + Config.VIEW_CACHE_TTL_SECS)
+
+            body, status_code, mimetype, etag = entry
+            response = current_app.response_class(body, status=status_code, mimetype=mimetype)
+            response.set_etag(etag)
+            # Browsers must check the page with the server before reusing it, since the server
+            # decides whether the user can see it
+            response.cache_control.no_cache = True
+            response.cache_control.private = per_user or None
+            return response.make_conditional(request)
+
+        return wrapper
+
+    return decorator
+
+
+def get_stats():
+    """
+    Retrieve the counters of the view response cache, which can be used to monitor its hit rate.
+
+    :return: A dictionary with the cache size, max size, hits and misses.
+    """
+
+    return _view_cache.stats()
@@ -8,6 +8,7 @@ class AppHeader extends HTMLElement {
       login: this.getAttribute("data-login"),
       register: this.getAttribute("data-register"),
       myAccount: this.getAttribute("data-my-account"),
+      logoSrcset: this.getAttribute("data-logo-srcset"),
     };
 
     if (!this.data.home) {
@@ -21,7 +22,11 @@ class AppHeader extends HTMLElement {
       <header class="header">
         <a href="${
           this.data.home
-        }"><img src="/static/images/logo/logo-transparent.png" /></a>
+        }"><img src="/static/images/logo/logo-transparent.png" ${
+          this.data.logoSrcset
+            ? `srcset="${this.data.logoSrcset}" sizes="11vh"`
+            : ""
+        } /></a>
         <nav>
           <ul>
             ${
@@ -33,7 +33,7 @@ function createCards() {
     card.dataset.value = value;
 
     const img = document.createElement("img");
-    img.src = value;
+    setResponsiveImage(img, value, "10vw");
     img.style.display = "none";
     img.classList.add("card-image");
     card.appendChild(img);
@@ -0,0 +1,20 @@
+// Variants of the images built by `flask assets build`, embedded by the page in an
+// <script type="application/json" id="image-variants"> element. They map the URL of each original
+// image to the srcset of each format.
+const imageVariantsElement = document.getElementById("image-variants");
+const imageVariants = imageVariantsElement
+  ? JSON.parse(imageVariantsElement.textContent)
+  : {};
+
+// Sets the image source, along with the WebP variants when they were built, so that the browser
+// downloads a small image of the size it displays instead of the original PNG. The original URL is
+// kept in src, so comparing sources still works.
+function setResponsiveImage(img, src, sizes) {
+  img.src = src;
+
+  const variants = imageVariants[src];
+  if (variants && variants.webp) {
+    img.sizes = sizes;
+    img.srcset = variants.webp;
+  }
+}
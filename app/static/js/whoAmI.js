@@ -30,7 +30,7 @@ function createImageShadow() {
 
   imgShadowContainer.innerHTML = "";
   const img = document.createElement("img");
-  img.src = shadowImageSrc;
+  setResponsiveImage(img, shadowImageSrc, "40vw");
   imgShadowContainer.appendChild(img);
 }
 
@@ -51,7 +51,7 @@ function createImageOptions() {
 
   options.forEach((image) => {
     const img = document.createElement("img");
-    img.src = image;
+    setResponsiveImage(img, image, "15vw");
     img.classList.add("option-image");
     img.addEventListener("click", () => {
       const shadowImage = imgShadowContainer.querySelector("img");
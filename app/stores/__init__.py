@@ -0,0 +1,93 @@
+"""
+Storage backends used by the services. The session store backend is selected with the SESSION_STORE
+setting and created on first use, like the rate limit store.
+"""
+
+import threading
+
+from config import Config
+
+_session_store = None
+_session_store_lock = threading.Lock()
+_rate_limit_store = None
+_rate_limit_store_lock = threading.Lock()
+
+
+def parse_address(address):
+    """
+    Parse a "host:port" string into the (host, port) tuple used by the session state server.
+
+    :param address: The address to parse.
+    :return: A tuple containing the host and the port.
+    """
+
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def create_session_store(backend):
+    """
+    Create a session store for the given backend name.
+
+    :param backend: Either "sql" or "memory".
+    :return: The new session store.
+    :raises ValueError: If the backend name is unknown.
+    """
+
+    if backend == "sql":
+        from .sql_session_store import SqlSessionStore
+
+        return SqlSessionStore()
+
+    if backend == "memory":
+        from .memory_session_store import MemorySessionStore
+
+        if not Config.SESSION_STORE_ADDRESS:
+            return MemorySessionStore()
+        return MemorySessionStore(
+            parse_address(Config.SESSION_STORE_ADDRESS),
+            Config.SESSION_STORE_AUTHKEY.encode(),
+        )
+
+    raise ValueError(f"Unknown session store backend: {backend}.")
+
+
+def get_session_store():
+    """
+    Retrieve the session store configured with the SESSION_STORE setting, creating it on first use.
+
+    :return: The session store of the current process.
+    """
+
+    global _session_store
+
+    if _session_store is None:
+        with _session_store_lock:
+            if _session_store is None:
+                _session_store = create_session_store(Config.SESSION_STORE)
+    return _session_store
+
+
+def get_rate_limit_store():
+    """
+    Retrieve the rate limit store, creating it on first use. The counters are shared with the
+    server at RATE_LIMIT_STORE_ADDRESS if it is set, or kept in the current process otherwise.
+
+    :return: The rate limit store of the current process.
+    """
+
+    global _rate_limit_store
+
+    if _rate_limit_store is None:
+        with _rate_limit_store_lock:
+            if _rate_limit_store is None:
+                from .rate_limit_store import RateLimitStore
+
+                if not Config.RATE_LIMIT_STORE_ADDRESS:
+                    _rate_limit_store = RateLimitStore()
+                else:
+                    _rate_limit_store = RateLimitStore(
+                        parse_address(Config.RATE_LIMIT_STORE_ADDRESS),
+                        Config.RATE_LIMIT_STORE_AUTHKEY.encode(),
+                    )
+    return _rate_limit_store
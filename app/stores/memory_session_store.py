@@ -0,0 +1,218 @@
+"""
+Session store that keeps sessions in memory with a time to live. The sessions can live in the
+memory of the worker process or in a separate key-value server shared by every worker, started
+with `flask sessions serve-store`. Either way, refreshing and revoking sessions never touch the
+relational database.
+"""
+
+import heapq
+import threading
+from dataclasses import replace
+from datetime import datetime, timezone
+from multiprocessing.managers import BaseManager
+
+from app.models.ids import uuid7
+from app.models.session import Session
+
+from .session_store import SessionRecord, SessionStore
+
+
+class MemorySessionState:
+    """
+    The sessions kept in memory, with indexes by refresh token digest and by user. Only the digest
+    of each refresh token is kept, like in the relational database. Every method holds a
+    lock for its whole duration, so each operation is atomic when the state is shared between
+    threads or served to other processes. Expired sessions are removed lazily by the lookups and in
+    expiration order by `delete_expired`, which pops them from a heap of expirations.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._refresh_token_hashes = {}
+        self._by_refresh_token = {}
+        self._by_user = {}
+        self._expirations = []
+
+    def create(self, user_id, name, email):
+        refresh_token = Session.generate_refresh_token()
+        session = SessionRecord(
+            id=uuid7(),
+            user_id=user_id,
+            name=name,
+            email=email,
+            refresh_token=None,
+            expires_at=Session.calculate_expiration(),
+        )
+
+        with self._lock:
+            self._add(session, Session.hash_refresh_token(refresh_token))
+        return replace(session, refresh_token=refresh_token)
+
+    def get_by_id(self, session_id):
+        with self._lock:
+            return self._find(session_id)
+
+    def get_by_refresh_token(self, refresh_token):
+        token_hash = Session.hash_refresh_token(refresh_token)
+
+        with self._lock:
+            return self._find(self._by_refresh_token.get(token_hash))
+
+    def rotate(self, refresh_token):
+        token_hash = Session.hash_refresh_token(refresh_token)
+        new_refresh_token = Session.generate_refresh_token()
+
+        with self._lock:
+            session = self._find(self._by_refresh_token.get(token_hash))
+
+            if not session:
+                return None
+
+            self._remove(session)
+            session = replace(session, expires_at=Session.calculate_expiration())
+            self._add(session, Session.hash_refresh_token(new_refresh_token))
+
+        return replace(session, refresh_token=new_refresh_token)
+
+    def delete(self, session_id):
+        with self._lock:
+            session = self._find(session_id)
+
+            if not session:
+                return False
+
+            self._remove(session)
+            return True
+
+    def delete_expired(self, batch_size):
+        now = datetime.now(timezone.utc)
+        deleted = 0
+
+        with self._lock:
+            while self._expirations and deleted < batch_size:
+                expires_at, session_id = self._expirations[0]
+
+                if expires_at >= now:
+                    break
+
+                heapq.heappop(self._expirations)
+                session = self._sessions.get(session_id)
+
+                # Rotated sessions leave stale heap entries behind with their old expiration
+                if session and session.expires_at == expires_at:
+                    self._remove(session)
+                    deleted += 1
+
+        return deleted
+
+    def update_user(self, user_id, name, email):
+        with self._lock:
+            for session_id in self._by_user.get(user_id, ()):
+                session = self._sessions[session_id]
+                self._sessions[session_id] = replace(session, name=name, email=email)
+
+    def delete_user_sessions(self, user_id):
+        with self._lock:
+            sessions = [self._sessions[i] for i in self._by_user.get(user_id, ())]
+
+            for session in sessions:
+                self._remove(session)
+            return len(sessions)
+
+    def _find(self, session_id):
+        session = self._sessions.get(session_id)
+
+        if session:
+            if datetime.now(timezone.utc) <= session.expires_at:
+                return session
+            self._remove(session)
+
+    def _add(self, session, token_hash):
+        self._sessions[session.id] = session
+        self._refresh_token_hashes[session.id] = token_hash
+        self._by_refresh_token[token_hash] = session.id
+        self._by_user.setdefault(session.user_id, set()).add(session.id)
+        heapq.heappush(self._expirations, (session.expires_at, session.id))
+
+    def _remove(self, session):
+        del self._sessions[session.id]
+        del self._by_refresh_token[self._refresh_token_hashes.pop(session.id)]
+
+        user_sessions = self._by_user[session.user_id]
+        user_sessions.discard(session.id)
+        if not user_sessions:
+            del self._by_user[session.user_id]
+
+        # The heap entry of a removed session stays behind until it is popped. Once dead entries
+        # outnumber live ones, the heap is rebuilt from the live sessions, so it stays proportional
+        # to them even when `delete_expired` never runs
+        if len(self._expirations) > 2 * len(self._sessions):
+            self._expirations = [(s.expires_at, s.id) for s in self._sessions.values()]
+            heapq.heapify(self._expirations)
+
+
+class SessionStateManager(BaseManager):
+    """
+    Manager used to serve a MemorySessionState to other processes and to connect to it.
+    """
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Session store that delegates to a MemorySessionState. Without an address, the state lives in
+    the current process. With an address, the store connects to the state served by
+    `serve_session_state` at that address.
+
+    :param address: Optional (host, port) tuple of the session state server.
+    :param authkey: The authentication key shared with the session state server.
+    """
+
+    def __init__(self, address=None, authkey=None):
+        if address is None:
+            self._state = MemorySessionState()
+        else:
+            SessionStateManager.register("get_state")
+            manager = SessionStateManager(address=address, authkey=authkey)
+            manager.connect()
+            self._state = manager.get_state()  # type: ignore
+
+    def create(self, user_id, name, email):
+        return self._state.create(user_id, name, email)
+
+    def get_by_id(self, session_id):
+        return self._state.get_by_id(session_id)
+
+    def get_by_refresh_token(self, refresh_token):
+        return self._state.get_by_refresh_token(refresh_token)
+
+    def rotate(self, refresh_token):
+        return self._state.rotate(refresh_token)
+
+    def delete(self, session_id):
+        return self._state.delete(session_id)
+
+    def delete_expired(self, batch_size):
+        return self._state.delete_expired(batch_size)
+
+    def update_user(self, user_id, name, email):
+        self._state.update_user(user_id, name, email)
+
+    def delete_user_sessions(self, user_id):
+        return self._state.delete_user_sessions(user_id)
+
+
+def serve_session_state(address, authkey):
+    """
+    Serve a single MemorySessionState at the given address until the process is interrupted. The
+    memory session stores of every worker configured with this address share the served state.
+
+    :param address: The (host, port) tuple to listen on.
+    :param authkey: The authentication key that clients must present.
+    :return: None
+    """
+
+    state = MemorySessionState()
+    SessionStateManager.register("get_state", callable=lambda: state)
+    manager = SessionStateManager(address=address, authkey=authkey)
+    manager.get_server().serve_forever()
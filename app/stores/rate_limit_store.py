@@ -0,0 +1,175 @@
+"""
+Counter store used by the rate limiter. Each key keeps only the index of its current fixed window
+and the hit counts of that window and of the previous one, from which a sliding window count is
+estimated. The counters can live in the memory of the worker process or in a separate server shared
+by every worker, started with `flask rate-limits serve-store`.
+"""
+
+import math
+import threading
+import time
+from multiprocessing.managers import BaseManager
+
+
+class SlidingWindowCounters:
+    """
+    Sliding window counters by key. The number of hits in the last window is estimated as the hits
+    of the current fixed window plus the hits of the previous one, weighted by the part of the
+    previous window that still overlaps the sliding window. Every method holds a lock for its whole
+    duration, so each operation is atomic when the counters are shared between threads or served to
+    other processes. Keys whose windows have both elapsed are pruned once per window.
+
+    :param clock: Function returning the current time in seconds.
+    """
+
+    def __init__(self, clock=time.time):
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._counters = {}
+        self._pruned_at = {}
+
+    def hit(self, limits, window_secs):
+        """
+        Count a hit on every key if none of them has reached its limit in the sliding window.
+        Rejected hits are not counted, so a client that keeps retrying is let through as soon as
+        its earlier hits leave the window.
+
+        :param limits: A list of (key, limit) pairs to check together.
+        :param window_secs: The length of the sliding window, in seconds.
+        :return: A tuple containing whether the hit was allowed and, if it was not, the number of
+                 seconds until it would be.
+        """
+
+        now = self._clock()
+        window = int(now // window_secs)
+        elapsed = now / window_secs - window
+
+        with self._lock:
+            self._prune(window_secs, window)
+            retry_after = 0.0
+
+            for key, limit in limits:
+                current, previous = self._counts(key, window)
+                wait = self._wait(current, previous, limit, elapsed)
+                retry_after = max(retry_after, wait * window_secs)
+
+            if retry_after:
+                return False, max(math.ceil(retry_after), 1)
+
+            for key, _ in limits:
+                current, previous = self._counts(key, window)
+                self._counters[key] = (window, current + 1, previous)
+
+        return True, 0
+
+    def size(self):
+        """
+        Retrieve the number of keys with counters.
+
+        :return: The number of keys.
+        """
+
+        with self._lock:
+            return len(self._counters)
+
+    def clear(self):
+        """
+        Remove every counter.
+
+        :return: None
+        """
+
+        with self._lock:
+            self._counters.clear()
+
+    def _counts(self, key, window):
+        counter = self._counters.get(key)
+
+        if counter is None:
+            return 0, 0
+
+        counter_window, current, previous = counter
+
+        if counter_window == window:
+            return current, previous
+        if counter_window == window - 1:
+            return 0, current
+        return 0, 0
+
+    @staticmethod
+    def _wait(current, previous, limit, elapsed):
+        """
+        Compute the fraction of a window to wait until one more hit fits in the limit, or 0 if it
+        already fits.
+        """
+
+        if previous * (1 - elapsed) + current + 1 <= limit:
+            return 0.0
+
+        # The hits of the previous window leave the sliding window linearly
+        if current + 1 <= limit:
+            return 1 - (limit - 1 - current) / previous - elapsed
+
+        # Otherwise the current hits must first become the previous window
+        return 1 - elapsed + 1 - (limit - 1) / current
+
+    def _prune(self, window_secs, window):
+        if self._pruned_at.get(window_secs) == window:
+            return
+
+        self._pruned_at[window_secs] = window
+        stale = [key for key, counter in self._counters.items() if counter[0] < window - 1]
+
+        for key in stale:
+            del self._counters[key]
+
+
+class RateLimitStateManager(BaseManager):
+    """
+    Manager used to serve SlidingWindowCounters to other processes and to connect to them.
+    """
+
+
+class RateLimitStore:
+    """
+    Rate limit store that delegates to SlidingWindowCounters. Without an address, the counters live
+    in the current process. With an address, the store connects to the counters served by
+    `serve_rate_limit_state` at that address.
+
+    :param address: Optional (host, port) tuple of the rate limit state server.
+    :param authkey: The authentication key shared with the rate limit state server.
+    """
+
+    def __init__(self, address=None, authkey=None):
+        if address is None:
+            self._counters = SlidingWindowCounters()
+        else:
+            RateLimitStateManager.register("get_counters")
+            manager = RateLimitStateManager(address=address, authkey=authkey)
+            manager.connect()
+            self._counters = manager.get_counters()  # type: ignore
+
+    def hit(self, limits, window_secs):
+        return self._counters.hit(limits, window_secs)
+
+    def size(self):
+        return self._counters.size()
+
+    def clear(self):
+        self._counters.clear()
+
+
+def serve_rate_limit_state(address, authkey):
+    """
+    Serve a single SlidingWindowCounters at the given address until the process is interrupted. The
+    rate limit stores of every worker configured with this address share the served counters.
+
+    :param address: The (host, port) tuple to listen on.
+    :param authkey: The authentication key that clients must present.
+    :return: None
+    """
+
+    counters = SlidingWindowCounters()
+    RateLimitStateManager.register("get_counters", callable=lambda: counters)
+    manager = RateLimitStateManager(address=address, authkey=authkey)
+    manager.get_server().serve_forever()
@@ -0,0 +1,116 @@
+"""
+Interface shared by the session store backends. The session service only talks to sessions through
+this interface, so the backend can be chosen per deployment with the SESSION_STORE setting.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+
+@dataclass(frozen=True)
+class SessionRecord:
+    """
+    Immutable snapshot of a session as returned by the session stores. It includes the name and
+    email of the session's user, which are needed to issue new access tokens.
+
+    :ivar id: The ID of the session.
+    :ivar user_id: The ID of the user who owns the session.
+    :ivar name: The name of the user who owns the session.
+    :ivar email: The email of the user who owns the session.
+    :ivar refresh_token: The new refresh token of the session when it was just created or rotated.
+                         Stores only keep a digest of the token, so it is None otherwise.
+    :ivar expires_at: The moment after which the session is no longer valid.
+    """
+
+    id: UUID
+    user_id: UUID
+    name: str
+    email: str
+    refresh_token: Optional[str]
+    expires_at: datetime
+
+
+class SessionStore(ABC):
+    """
+    Base class for session store backends. Every method is atomic: a backend must never expose a
+    partially updated session. Expired sessions are never returned by the lookup methods.
+    """
+
+    @abstractmethod
+    def create(self, user_id, name, email) -> SessionRecord:
+        """
+        Create a new session for the given user with a new refresh token.
+
+        :param user_id: The ID of the user for whom the session is being created.
+        :param name: The name of the user.
+        :param email: The email of the user.
+        :return: The newly created session.
+        """
+
+    @abstractmethod
+    def get_by_id(self, session_id) -> Optional[SessionRecord]:
+        """
+        Retrieve a valid session by its ID.
+
+        :param session_id: The ID of the session to retrieve.
+        :return: The session if found and not expired, otherwise None.
+        """
+
+    @abstractmethod
+    def get_by_refresh_token(self, refresh_token) -> Optional[SessionRecord]:
+        """
+        Retrieve a valid session by its refresh token.
+
+        :param refresh_token: The refresh token associated with the session.
+        :return: The session if found and not expired, otherwise None.
+        """
+
+    @abstractmethod
+    def rotate(self, refresh_token) -> Optional[SessionRecord]:
+        """
+        Replace the refresh token of a valid session with a new one and extend its expiration.
+
+        :param refresh_token: The current refresh token of the session.
+        :return: The updated session if found and not expired, otherwise None.
+        """
+
+    @abstractmethod
+    def delete(self, session_id) -> bool:
+        """
+        Delete a session by its ID.
+
+        :param session_id: The ID of the session to delete.
+        :return: True if a valid session was deleted, False otherwise.
+        """
+
+    @abstractmethod
+    def delete_expired(self, batch_size) -> int:
+        """
+        Delete up to `batch_size` expired sessions.
+
+        :param batch_size: The maximum number of sessions to delete.
+        :return: The number of sessions deleted.
+        """
+
+    @abstractmethod
+    def update_user(self, user_id, name, email) -> None:
+        """
+        Update the user information kept with the sessions of the given user.
+
+        :param user_id: The ID of the user.
+        :param name: The new name of the user.
+        :param email: The new email of the user.
+        :return: None
+        """
+
+    @abstractmethod
+    def delete_user_sessions(self, user_id) -> int:
+        """
+        Delete every session of the given user.
+
+        :param user_id: The ID of the user.
+        :return: The number of sessions deleted.
+        """
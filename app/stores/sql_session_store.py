@@ -0,0 +1,175 @@
+"""
+Session store backed by the `sessions` table of the relational database. The user information of
+each session is read from the `users` table, so it is always up to date.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, or_, select, update
+
+from app.extensions import db
+from app.models.session import Session
+from app.models.user import User
+from config import Config
+
+from .session_store import SessionRecord, SessionStore
+
+
+def _transaction():
+    """
+    Begin a transaction, or a savepoint if the caller already has a transaction open. In the latter
+    case, the caller is responsible for committing the outer transaction.
+    """
+
+    orm_session = db.session()
+    return orm_session.begin_nested() if orm_session.in_transaction() else orm_session.begin()
+
+
+_user_name = (
+    select(User.name).where(User.id == Session.user_id).correlate(Session).scalar_subquery()
+)
+_user_email = (
+    select(User.email).where(User.id == Session.user_id).correlate(Session).scalar_subquery()
+)
+_record_columns = (
+    Session.id,
+    Session.user_id,
+    _user_name.label("name"),
+    _user_email.label("email"),
+    Session.expires_at,
+)
+"""
+Columns of a SessionRecord. The user columns are correlated subqueries rather than a join, so they
+can also be used in the RETURNING clause of an UPDATE, which SQLite restricts to the updated table.
+"""
+
+
+def _to_record(row, refresh_token=None):
+    return SessionRecord(refresh_token=refresh_token, **row._mapping)
+
+
+def _refresh_token_criterion(refresh_token):
+    """
+    Build the criterion that matches the session of the given refresh token by its digest. While
+    REFRESH_TOKEN_LEGACY_LOOKUP is enabled, sessions that still store the plaintext token also
+    match.
+    """
+
+    criterion = Session.refresh_token_hash == Session.hash_refresh_token(refresh_token)
+
+    if Config.REFRESH_TOKEN_LEGACY_LOOKUP:
+        return or_(criterion, Session.refresh_token == refresh_token)
+    return criterion
+
+
+def _is_expired(expires_at):
+    return datetime.now(timezone.utc) > expires_at.replace(tzinfo=timezone.utc)
+
+
+class SqlSessionStore(SessionStore):
+    """
+    Session store that keeps sessions in the relational database through SQLAlchemy. Every
+    operation is a single statement that reads the user information along with the session, so the
+    user row is never lazy loaded. Expired sessions are left for the sweeper to delete.
+    """
+
+    def create(self, user_id, name, email):
+        refresh_token = Session.generate_refresh_token()
+
+        with _transaction():
+            session = Session(
+                user_id=user_id,
+                refresh_token_hash=Session.hash_refresh_token(refresh_token),
+            )  # type: ignore
+            db.session.add(session)
+            # The defaults are filled in by the flush. Reading them after the commit would load the
+            # expired row again and leave a new transaction open.
+            db.session.flush()
+
+            return SessionRecord(
+                id=session.id,
+                user_id=session.user_id,
+                name=name,
+                email=email,
+                refresh_token=refresh_token,
+                expires_at=session.expires_at,
+            )
+
+    def get_by_id(self, session_id):
+        return self._find(Session.id == session_id)
+
+    def get_by_refresh_token(self, refresh_token):
+        return self._find(_refresh_token_criterion(refresh_token))
+
+    def rotate(self, refresh_token):
+        new_refresh_token = Session.generate_refresh_token()
+        now = datetime.now(timezone.utc)
+        statement = (
+            update(Session)
+            .where(_refresh_token_criterion(refresh_token), Session.expires_at > now)
+            .values(
+                refresh_token=None,
+                refresh_token_hash=Session.hash_refresh_token(new_refresh_token),
+                expires_at=Session.calculate_expiration(),
+                updated_at=now,
+                version=Session.version + 1,
+            )
+            .returning(*_record_columns)
+        )
+
+        with _transaction():
+            row = db.session.execute(
+                statement, execution_options={"synchronize_session": False}
+            ).first()
+            return _to_record(row, new_refresh_token) if row else None
+
+    def delete(self, session_id):
+        statement = (
+            delete(Session).where(Session.id == session_id).returning(Session.expires_at)
+        )
+
+        with _transaction():
+            expires_at = db.session.execute(
+                statement, execution_options={"synchronize_session": False}
+            ).scalar()
+            return expires_at is not None and not _is_expired(expires_at)
+
+    def delete_expired(self, batch_size):
+        with _transaction():
+            expired_ids = (
+                select(Session.id)
+                .where(Session.expires_at < datetime.now(timezone.utc))
+                .limit(batch_size)
+                .scalar_subquery()
+            )
+            result = db.session.execute(
+                delete(Session).where(Session.id.in_(expired_ids)),
+                execution_options={"synchronize_session": False},
+            )
+            return result.rowcount
+
+    def update_user(self, user_id, name, email):
+        # The user information is read from the users table on every lookup.
+        pass
+
+    def delete_user_sessions(self, user_id):
+        with _transaction():
+            result = db.session.execute(
+                delete(Session).where(Session.user_id == user_id),
+                execution_options={"synchronize_session": False},
+            )
+            return result.rowcount
+
+    @staticmethod
+    def _find(criterion):
+        """
+        Find the valid session that matches the given criterion, along with its user information.
+        """
+
+        statement = select(*_record_columns).where(
+            criterion, Session.expires_at > datetime.now(timezone.utc)
+        )
+
+        with _transaction():
+            row = db.session.execute(statement).first()
+            return _to_record(row) if row else None
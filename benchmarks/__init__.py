@@ -0,0 +1,54 @@
+"""
+Benchmarks of the application. Each module runs with `python -m benchmarks.<module>` from the
+project root and prints its measurements. They run against a temporary SQLite database migrated
+with the project's migrations, unless DATABASE_URL is set.
+"""
+
+import os
+import tempfile
+import time
+
+
+def create_benchmark_app(**settings):
+    """
+    Create the application against a temporary database, unless DATABASE_URL is set, and apply
+    the migrations.
+
+    :param settings: Environment variables to set before the application is imported, such as
+                     SESSION_STORE="memory".
+    :return: The Flask application.
+    """
+
+    if "DATABASE_URL" not in os.environ:
+        database_dir = tempfile.mkdtemp()
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(database_dir, 'benchmark.db')}"
+    os.environ.update({name: str(value) for name, value in settings.items()})
+
+    from flask_migrate import upgrade
+
+    from app import create_app
+    from app.commands import init_migrations
+
+    app = create_app()
+    init_migrations(app)
+    migrations_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "migrations")
+
+    with app.app_context():
+        upgrade(directory=migrations_dir)
+
+    return app
+
+
+def measure(fn, operations):
+    """
+    Call a function a number of times and measure its throughput.
+
+    :param fn: The function to call, without arguments.
+    :param operations: The number of calls.
+    :return: The number of calls per second.
+    """
+
+    started = time.perf_counter()
+    for _ in range(operations):
+        fn()
+    return operations / (time.perf_counter() - started)
@@ -0,0 +1,68 @@
+"""
+Time taken by the DTO layer to build API responses with each JSON provider, for bodies with only a
+constant message, which are serialized once and reused, and for bodies with data or validation
+errors, which are serialized on every call. The responses are built in a request context without
+new session tokens, so no cookies are set.
+
+    python -m benchmarks.dto_responses --operations 20000
+"""
+
+import argparse
+import timeit
+
+CASES = {
+    "static success": lambda dtos: dtos.SuccessResponseDto(200, "Login realizado com sucesso."),
+    "static error": lambda dtos: dtos.ErrorResponseDto(401, "Credenciais inválidas."),
+    "with data": lambda dtos: dtos.SuccessResponseDto(
+        200,
+        "Usuário recuperado com sucesso.",
+        {"name": "Ana", "email": "ana@example.com", "created_at": "2026-10-18T12:00:00+00:00"},
+    ),
+    "with validation errors": lambda dtos: dtos.ErrorResponseDto(
+        400,
+        "Erro de validação.",
+        {"email": ["E-mail inválido."], "password": ["Senha deve conter pelo menos um dígito."]},
+    ),
+}
+
+
+def run(app, provider, operations, repeat):
+    from app.controllers import dtos
+
+    app.json = provider(app)
+    results = {}
+
+    with app.test_request_context("/api/auth/login", method="POST"):
+        for name, case in CASES.items():
+            times = timeit.repeat(
+                lambda: case(dtos).to_response(), number=operations, repeat=repeat
+            )
+            results[name] = min(times) / operations
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--operations", type=int, default=20000, help="Responses per run.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs of each case; the best counts.")
+    args = parser.parse_args()
+
+    from app import create_app
+    from app.json_provider import PROVIDERS
+
+    app = create_app()
+
+    for provider_name, provider in PROVIDERS.items():
+        try:
+            results = run(app, provider, args.operations, args.repeat)
+        except RuntimeError as e:
+            print(f"{provider_name}: {e}")
+            continue
+
+        for name, seconds in results.items():
+            print(f"{provider_name:<7} {name:<23} {seconds * 1e6:6.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
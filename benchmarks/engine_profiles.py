@@ -0,0 +1,90 @@
+"""
+Throughput of logins and session refreshes through the API with several database engine profiles.
+Each profile runs in its own interpreter, since the settings are read when config is imported,
+against a new temporary database. Every thread logs in and refreshes its session with the refresh
+token alone, in turn, as its own user. Passwords are hashed inline at the lowest bcrypt cost, so
+the database dominates.
+
+    python -m benchmarks.engine_profiles --threads 16 --rounds 20
+"""
+
+import argparse
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks import create_benchmark_app
+
+PROFILES = {
+    "default": {},
+    "rollback-journal": {"SQLITE_JOURNAL_MODE": "delete", "SQLITE_SYNCHRONOUS": "full"},
+    "no-pre-ping": {"DB_POOL_PRE_PING": "false"},
+    "single-connection": {"DB_POOL_SIZE": 1, "DB_MAX_OVERFLOW": 0},
+}
+
+PASSWORD = "Senha@123"
+
+
+def run(profile, threads, rounds):
+    app = create_benchmark_app(
+        PASSWORD_HASHER="bcrypt",
+        PASSWORD_HASH_WORKERS=0,
+        BCRYPT_LOG_ROUNDS=4,
+        RATE_LIMIT_LOGIN_PER_IP=0,
+        RATE_LIMIT_LOGIN_PER_EMAIL=0,
+        RATE_LIMIT_REGISTER_PER_IP=0,
+        RATE_LIMIT_REGISTER_PER_EMAIL=0,
+        **PROFILES[profile],
+    )
+    failures = []
+
+    for number in range(threads):
+        credentials = {"name": "Ana", "email": f"ana{number}@example.com", "password": PASSWORD}
+        app.test_client().post("/api/auth/register", json=credentials)
+
+    def worker(number):
+        client = app.test_client()
+        credentials = {"email": f"ana{number}@example.com", "password": PASSWORD}
+
+        for _ in range(rounds):
+            response = client.post("/api/auth/login", json=credentials)
+            client.delete_cookie("access_token")
+            refresh = client.get("/api/my-account")
+            failures.extend(
+                status for status in (response.status_code, refresh.status_code) if status != 200
+            )
+
+    workers = [threading.Thread(target=worker, args=(number,)) for number in range(threads)]
+    started = time.perf_counter()
+
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    return threads * rounds / (time.perf_counter() - started), failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16, help="Concurrent clients.")
+    parser.add_argument("--rounds", type=int, default=20, help="Logins and refreshes per client.")
+    parser.add_argument("--profile", choices=PROFILES, action="append", help="Can be repeated.")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        rate, failures = run(args.profile[0], args.threads, args.rounds)
+        print(f"{args.profile[0]:<18} {rate:,.0f} logins and refreshes/s, {len(failures)} failed")
+        return
+
+    for profile in args.profile or PROFILES:
+        command = [sys.executable, "-m", "benchmarks.engine_profiles", "--child"]
+        command += ["--profile", profile, "--threads", str(args.threads)]
+        command += ["--rounds", str(args.rounds)]
+        subprocess.run(command, check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Throughput of the access token verification with and without the cache of verified JWT payloads,
+for a number of distinct tokens used in turn, like the tokens of the users active at a time.
+
+    python -m benchmarks.jwt_cache --tokens 1000 --operations 100000
+"""
+
+import argparse
+from itertools import cycle
+from uuid import uuid4
+
+from benchmarks import measure
+
+
+def run(tokens, operations, cache_size):
+    from app.services import session_service
+
+    cache = session_service._jwt_cache
+    cache.clear()
+    cache.max_size = cache_size
+    tokens = cycle(
+        [
+            session_service.create_jwt(uuid4(), uuid4(), "Ana", "ana@example.com")
+            for _ in range(tokens)
+        ]
+    )
+
+    return measure(lambda: session_service.decode_jwt(next(tokens)), operations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=1000, help="Distinct tokens.")
+    parser.add_argument("--operations", type=int, default=100000, help="Tokens verified.")
+    args = parser.parse_args()
+
+    uncached = run(args.tokens, args.operations, 0)
+    cached = run(args.tokens, args.operations, args.tokens)
+    print(f"uncached {uncached:,.0f}/s")
+    print(f"cached   {cached:,.0f}/s ({cached / uncached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
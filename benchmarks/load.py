@@ -0,0 +1,89 @@
+"""
+Load test of a running server: concurrent clients send GET requests to a URL over keep-alive
+connections for a fixed time, and the throughput is reported in total and per core of the server.
+Start the server first, such as with `gunicorn`, on the same machine or with --cores set to the
+cores of the server's machine.
+
+    python -m benchmarks.load http://127.0.0.1:8000/ --concurrency 16 --duration 10
+"""
+
+import argparse
+import http.client
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def run(url, concurrency, duration):
+    parts = urlsplit(url)
+    connection_class = (
+        http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    )
+    path = parts.path or "/"
+
+    if parts.query:
+        path += f"?{parts.query}"
+
+    lock = threading.Lock()
+    totals = {"completed": 0, "failed": 0}
+    stop_at = time.perf_counter() + duration
+
+    def client():
+        connection = connection_class(parts.netloc, timeout=30)
+        completed = failed = 0
+
+        while time.perf_counter() < stop_at:
+            try:
+                connection.request("GET", path)
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                connection.close()
+                continue
+
+            if response.status < 400:
+                completed += 1
+            else:
+                failed += 1
+
+            if response.will_close:
+                connection.close()
+
+        connection.close()
+
+        with lock:
+            totals["completed"] += completed
+            totals["failed"] += failed
+
+    clients = [threading.Thread(target=client) for _ in range(concurrency)]
+
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+
+    return totals["completed"] / duration, totals["failed"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("url", help="URL requested by the clients.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients.")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds of load.")
+    parser.add_argument(
+        "--cores",
+        type=int,
+        default=os.cpu_count(),
+        help="Cores of the server, for the throughput per core. Defaults to the cores here.",
+    )
+    args = parser.parse_args()
+
+    rate, failed = run(args.url, args.concurrency, args.duration)
+    print(f"{rate:,.0f} requests/s, {rate / args.cores:,.0f} requests/s per core", end="")
+    print(f" ({args.cores} cores), {failed} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Time taken to validate request bodies with the registration schema, with the shared instance and
+with a new instance per load, and to check a password against the password policy alone.
+
+    python -m benchmarks.schema_validation --operations 5000
+"""
+
+import argparse
+import timeit
+
+from marshmallow import ValidationError
+
+VALID = {"name": "Ana", "email": "ana@example.com", "password": "Senha@123"}
+INVALID = {"name": " ", "email": "ana@", "password": "senha"}
+
+
+def _load(schema, body):
+    try:
+        schema.load(body)
+    except ValidationError:
+        pass
+
+
+def run(operations, repeat):
+    from app.controllers.api.schemas.auth_schemas import RegisterSchema, register_schema
+    from app.controllers.api.schemas.validators import password_policy
+
+    cases = {
+        "shared schema, valid": lambda: _load(register_schema, VALID),
+        "shared schema, invalid": lambda: _load(register_schema, INVALID),
+        "new schema, valid": lambda: _load(RegisterSchema(), VALID),
+        "new schema, invalid": lambda: _load(RegisterSchema(), INVALID),
+        "password policy only": lambda: password_policy(VALID["password"]),
+    }
+
+    return {
+        name: min(timeit.repeat(case, number=operations, repeat=repeat)) / operations
+        for name, case in cases.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--operations", type=int, default=5000, help="Validations per run.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs of each case; the best counts.")
+    args = parser.parse_args()
+
+    for name, seconds in run(args.operations, args.repeat).items():
+        print(f"{name:<23} {seconds * 1e6:6.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
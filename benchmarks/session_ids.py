@@ -0,0 +1,101 @@
+"""
+Insert throughput and index size of the sessions table with random (version 4) and time-ordered
+(version 7) session ids. Each generator fills its own SQLite file, created from the models, in
+batches of one transaction each; the sizes are read from the dbstat table of SQLite.
+
+    python -m benchmarks.session_ids --rows 1000000
+"""
+
+import argparse
+import os
+import secrets
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+GENERATORS = ("uuid4", "uuid7")
+
+
+def _sizes(connection):
+    from sqlalchemy import text
+
+    rows = connection.execute(
+        text("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")
+    ).all()
+    return dict(rows)
+
+
+def run(generator, rows, batch_size):
+    from sqlalchemy import create_engine, insert
+
+    from app.models.ids import uuid7
+    from app.models.session import Session
+    from app.models.user import User
+
+    new_id = uuid7 if generator == "uuid7" else uuid4
+    path = os.path.join(tempfile.mkdtemp(), f"{generator}.db")
+    engine = create_engine(f"sqlite:///{path}")
+    User.metadata.create_all(engine, tables=[User.__table__, Session.__table__])
+    user_id = uuid4()
+
+    with engine.begin() as connection:
+        connection.execute(
+            insert(User).values(
+                id=user_id,
+                name="Ana",
+                email="ana@example.com",
+                email_normalized="ana@example.com",
+                password_hash="unused",
+            )
+        )
+
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(days=30)
+    elapsed = 0
+
+    for start in range(0, rows, batch_size):
+        batch = [
+            {
+                "id": new_id(),
+                "user_id": user_id,
+                "created_at": now,
+                "updated_at": now,
+                "expires_at": expires_at,
+                "refresh_token_hash": secrets.token_bytes(32),
+            }
+            for _ in range(min(batch_size, rows - start))
+        ]
+        started = time.perf_counter()
+
+        with engine.begin() as connection:
+            connection.execute(insert(Session), batch)
+
+        elapsed += time.perf_counter() - started
+
+    with engine.connect() as connection:
+        sizes = _sizes(connection)
+
+    engine.dispose()
+    primary_key_index = next(
+        size for name, size in sizes.items() if name.startswith("sqlite_autoindex_sessions")
+    )
+    return rows / elapsed, primary_key_index, os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Sessions inserted.")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Sessions per transaction.")
+    args = parser.parse_args()
+
+    for generator in GENERATORS:
+        rate, index_size, file_size = run(generator, args.rows, args.batch_size)
+        print(
+            f"{generator} {rate:,.0f} inserts/s, primary key index {index_size / 2**20:,.1f} MiB, "
+            f"database {file_size / 2**20:,.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
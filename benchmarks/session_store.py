@@ -0,0 +1,64 @@
+"""
+Throughput of the session store backends: sessions created, looked up by refresh token, rotated
+and deleted per second, one operation at a time on a single user.
+
+    python -m benchmarks.session_store --operations 2000
+"""
+
+import argparse
+from uuid import uuid4
+
+from benchmarks import create_benchmark_app, measure
+
+BACKENDS = ("sql", "memory")
+
+
+def run(app, backend, operations):
+    from app.extensions import db
+    from app.models.user import User
+    from app.stores import create_session_store
+
+    store = create_session_store(backend)
+    user_id = uuid4()
+
+    with app.app_context():
+        with db.session.begin():
+            db.session.add(
+                User(id=user_id, name="Ana", email=f"{user_id}@example.com", password_hash="x")
+            )
+
+        sessions = []
+
+        def create():
+            sessions.append(store.create(user_id, "Ana", "ana@example.com"))
+
+        results = {"create": measure(create, operations)}
+
+        tokens = iter([session.refresh_token for session in sessions])
+        results["lookup"] = measure(lambda: store.get_by_refresh_token(next(tokens)), operations)
+
+        tokens = iter([session.refresh_token for session in sessions])
+        results["rotate"] = measure(lambda: store.rotate(next(tokens)), operations)
+
+        ids = iter([session.id for session in sessions])
+        results["delete"] = measure(lambda: store.delete(next(ids)), operations)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--operations", type=int, default=2000, help="Operations of each kind.")
+    parser.add_argument("--backend", choices=BACKENDS, action="append", help="Can be repeated.")
+    args = parser.parse_args()
+
+    app = create_benchmark_app()
+
+    for backend in args.backend or BACKENDS:
+        results = run(app, backend, args.operations)
+        measurements = ", ".join(f"{name} {rate:,.0f}/s" for name, rate in results.items())
+        print(f"{backend:<8} {measurements}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,74 @@ class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "default_secret_key")
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///app.db")
 
+    # JSON provider: "orjson", "stdlib", or "auto" to use orjson when it is installed
+    JSON_PROVIDER = os.getenv("JSON_PROVIDER", "auto")
+
+    # Database engine configuration. The pool settings do not apply to in-memory SQLite databases
+    # and the SQLITE_* settings are only used with SQLite.
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT_SECS = float(os.getenv("DB_POOL_TIMEOUT_SECS", 30))
+    DB_POOL_RECYCLE_SECS = int(os.getenv("DB_POOL_RECYCLE_SECS", 1800))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true") == "true"
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "wal")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "normal")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", -16000))
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 134217728))
+
+    # Comma-separated URIs of read replicas of the database. Read-only queries of safe requests are
+    # sent to one of them at random, until the request writes to the primary.
+    DATABASE_REPLICA_URLS = [
+        url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+    ]
+
     # Session configuration
     SESSION_EXPIRATION_SECS = int(os.getenv("SESSION_EXPIRATION_SECS", 2592000))
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "default_jwt_secret_key")
     JWT_EXPIRATION_SECS = int(os.getenv("JWT_EXPIRATION_SECS", 900))
+    JWT_CACHE_MAX_SIZE = int(os.getenv("JWT_CACHE_MAX_SIZE", 10000))
+    REFRESH_GRACE_SECS = int(os.getenv("REFRESH_GRACE_SECS", 10))
+    REFRESH_GRACE_MAX_SIZE = int(os.getenv("REFRESH_GRACE_MAX_SIZE", 10000))
+    REFRESH_TOKEN_LEGACY_LOOKUP = os.getenv("REFRESH_TOKEN_LEGACY_LOOKUP", "true") == "true"
+
+    # Session store configuration
+    SESSION_STORE = os.getenv("SESSION_STORE", "sql")
+    SESSION_STORE_ADDRESS = os.getenv("SESSION_STORE_ADDRESS", "")
+    SESSION_STORE_AUTHKEY = os.getenv("SESSION_STORE_AUTHKEY", SECRET_KEY)
+
+    # Password hashing configuration
+    PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "bcrypt")
+    BCRYPT_LOG_ROUNDS = int(os.getenv("BCRYPT_LOG_ROUNDS", 12))
+    ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", 65536))
+    ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", 3))
+    ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", 1))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 64))
+    PASSWORD_HASH_TIMEOUT_SECS = float(os.getenv("PASSWORD_HASH_TIMEOUT_SECS", 10))
+    PASSWORD_HASH_RETRY_AFTER_SECS = int(os.getenv("PASSWORD_HASH_RETRY_AFTER_SECS", 2))
+
+    # Login and registration rate limiting configuration
+    RATE_LIMIT_WINDOW_SECS = int(os.getenv("RATE_LIMIT_WINDOW_SECS", 60))
+    RATE_LIMIT_LOGIN_PER_IP = int(os.getenv("RATE_LIMIT_LOGIN_PER_IP", 30))
+    RATE_LIMIT_LOGIN_PER_EMAIL = int(os.getenv("RATE_LIMIT_LOGIN_PER_EMAIL", 10))
+    RATE_LIMIT_REGISTER_PER_IP = int(os.getenv("RATE_LIMIT_REGISTER_PER_IP", 10))
+    RATE_LIMIT_REGISTER_PER_EMAIL = int(os.getenv("RATE_LIMIT_REGISTER_PER_EMAIL", 5))
+    RATE_LIMIT_STORE_ADDRESS = os.getenv("RATE_LIMIT_STORE_ADDRESS", "")
+    RATE_LIMIT_STORE_AUTHKEY = os.getenv("RATE_LIMIT_STORE_AUTHKEY", SECRET_KEY)
+
+    # Number of reverse proxies in front of the application whose X-Forwarded-For and
+    # X-Forwarded-Proto headers are trusted. Without them, every client shares the proxy's address.
+    TRUSTED_PROXIES = int(os.getenv("TRUSTED_PROXIES", 0))
+
+    # Metrics configuration
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+    # Expired session sweeper configuration
+    SESSION_SWEEP_INTERVAL_SECS = int(os.getenv("SESSION_SWEEP_INTERVAL_SECS", 0))
+    SESSION_SWEEP_BATCH_SIZE = int(os.getenv("SESSION_SWEEP_BATCH_SIZE", 1000))
+    SESSION_SWEEP_RATE = float(os.getenv("SESSION_SWEEP_RATE", 10))
+
+    # View response cache configuration. A max size of 0 disables the cache.
+    VIEW_CACHE_MAX_SIZE = int(os.getenv("VIEW_CACHE_MAX_SIZE", 1000))
+    VIEW_CACHE_TTL_SECS = int(os.getenv("VIEW_CACHE_TTL_SECS", 3600))
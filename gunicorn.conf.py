@@ -0,0 +1,63 @@
+"""
+Gunicorn configuration for production. Start the server with `gunicorn` from the project root; the
+settings below are read from the environment.
+
+The application is built once in the master process (preload) and the workers are forked from it,
+so they start instantly and share the memory of the loaded code. Each worker then gets its own
+database connections and, if enabled, its own expired session sweeper.
+"""
+
+import multiprocessing
+import os
+
+wsgi_app = "wsgi:app"
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+# Processes and threads. Password hashing runs in a separate process pool, so request threads
+# mostly wait on the database and the pool.
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count()))
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+worker_class = "gthread" if threads > 1 else "sync"
+
+# Every worker has its own password process pool. Unless configured, the cores are split between
+# the pools instead of giving each pool one process per core.
+os.environ.setdefault(
+    "PASSWORD_HASH_WORKERS", str(max(multiprocessing.cpu_count() // workers, 1))
+)
+
+# Workers are recycled after a number of requests, with some jitter so they do not all restart at
+# once, to bound the effect of memory leaks.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 10000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 1000))
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+
+preload_app = True
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-") or None
+errorlog = "-"
+
+
+def when_ready(server):
+    # The master only supervises the workers, which run their own sweepers
+    from app.services import sweeper_service
+
+    sweeper_service.stop_sweeper()
+
+
+def post_fork(server, worker):
+    from app.extensions import db
+    from app.services import sweeper_service
+    from config import Config
+
+    app = worker.app.wsgi()
+
+    # Connections opened by the master while the app was built must not be shared with the workers
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+    if Config.SESSION_SWEEP_INTERVAL_SECS > 0:
+        sweeper_service.start_sweeper(app)
@@ -0,0 +1,74 @@
+"""hash sessions refresh token
+
+Revision ID: 1506f1ad8b15
+Revises: 91e2945f9f0b
+Create Date: 2026-10-18 10:03:27.551902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import hashlib
+
+
+# revision identifiers, used by Alembic.
+revision = '1506f1ad8b15'
+down_revision = '91e2945f9f0b'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+sessions = sa.table(
+    'sessions',
+    sa.column('id', sa.UUID()),
+    sa.column('refresh_token', sa.String()),
+    sa.column('refresh_token_hash', sa.LargeBinary(length=32)),
+)
+
+
+def upgrade():
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('refresh_token_hash', sa.LargeBinary(length=32), nullable=True))
+        batch_op.alter_column('refresh_token',
+               existing_type=sa.String(),
+               nullable=True)
+
+    # Replace the plaintext refresh tokens with their digests in batches
+    connection = op.get_bind()
+    while True:
+        rows = connection.execute(
+            sa.select(sessions.c.id, sessions.c.refresh_token)
+            .where(sessions.c.refresh_token.is_not(None))
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        connection.execute(
+            sessions.update()
+            .where(sessions.c.id == sa.bindparam('session_id'))
+            .values(refresh_token=None, refresh_token_hash=sa.bindparam('token_hash')),
+            [
+                {
+                    'session_id': row.id,
+                    'token_hash': hashlib.sha256(row.refresh_token.encode()).digest(),
+                }
+                for row in rows
+            ],
+        )
+
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_sessions_refresh_token_hash'), ['refresh_token_hash'], unique=True)
+
+
+def downgrade():
+    # The plaintext tokens cannot be recovered from their digests, so those sessions are revoked
+    op.execute(sessions.delete().where(sessions.c.refresh_token.is_(None)))
+
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_sessions_refresh_token_hash'))
+        batch_op.alter_column('refresh_token',
+               existing_type=sa.String(),
+               nullable=False)
+        batch_op.drop_column('refresh_token_hash')
@@ -0,0 +1,66 @@
+"""add users created_at
+
+Revision ID: 5b0e3c9d8a14
+Revises: c3a81f5d2b67
+Create Date: 2026-10-18 12:21:17.563092
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from datetime import datetime, timezone
+
+
+# revision identifiers, used by Alembic.
+revision = '5b0e3c9d8a14'
+down_revision = 'c3a81f5d2b67'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+users = sa.table(
+    'users',
+    sa.column('id', sa.UUID()),
+    sa.column('created_at', sa.DateTime(timezone=True)),
+)
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(timezone=True), nullable=True))
+
+    # Version 7 ids start with their millisecond creation timestamp, so the creation time of the
+    # users created since they were introduced can be recovered. It stays unknown for the others.
+    connection = op.get_bind()
+    last_id = None
+    while True:
+        query = sa.select(users.c.id).order_by(users.c.id).limit(BACKFILL_BATCH_SIZE)
+        if last_id is not None:
+            query = query.where(users.c.id > last_id)
+
+        ids = connection.execute(query).scalars().all()
+        if not ids:
+            break
+        last_id = ids[-1]
+
+        values = [
+            {
+                'user_id': user_id,
+                'user_created_at': datetime.fromtimestamp((user_id.int >> 80) / 1000, timezone.utc),
+            }
+            for user_id in ids
+            if user_id.version == 7
+        ]
+        if values:
+            connection.execute(
+                users.update()
+                .where(users.c.id == sa.bindparam('user_id'))
+                .values(created_at=sa.bindparam('user_created_at')),
+                values,
+            )
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('created_at')
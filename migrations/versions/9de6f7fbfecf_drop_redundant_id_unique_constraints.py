@@ -0,0 +1,68 @@
+"""drop redundant id unique constraints
+
+Revision ID: 9de6f7fbfecf
+Revises: 1506f1ad8b15
+Create Date: 2026-10-18 10:48:05.120457
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9de6f7fbfecf'
+down_revision = '1506f1ad8b15'
+branch_labels = None
+depends_on = None
+
+# Names given to the unnamed constraints reflected by batch operations on SQLite
+naming_convention = {
+    'uq': 'uq_%(table_name)s_%(column_0_name)s',
+}
+
+
+def unique_id_constraint_names(table):
+    inspector = sa.inspect(op.get_bind())
+    return [
+        constraint['name'] or naming_convention['uq'] % {'table_name': table, 'column_0_name': 'id'}
+        for constraint in inspector.get_unique_constraints(table)
+        if constraint['column_names'] == ['id']
+    ]
+
+
+def sessions_user_id_foreign_key_name():
+    inspector = sa.inspect(op.get_bind())
+    for foreign_key in inspector.get_foreign_keys('sessions'):
+        if foreign_key['constrained_columns'] == ['user_id']:
+            return foreign_key['name']
+
+
+def upgrade():
+    # The primary keys already index the id columns, so the unique constraints created by the
+    # init migration only add a second index to maintain on every insert. On PostgreSQL the
+    # foreign key may depend on the index of users_id_key, so it is recreated around the drop.
+    foreign_key_name = None
+    if op.get_bind().dialect.name != 'sqlite':
+        foreign_key_name = sessions_user_id_foreign_key_name()
+        op.drop_constraint(foreign_key_name, 'sessions', type_='foreignkey')
+
+    for table in ('users', 'sessions'):
+        names = unique_id_constraint_names(table)
+        with op.batch_alter_table(table, schema=None, naming_convention=naming_convention) as batch_op:
+            for name in names:
+                batch_op.drop_constraint(name, type_='unique')
+
+    if foreign_key_name:
+        op.create_foreign_key(foreign_key_name, 'sessions', 'users', ['user_id'], ['id'])
+
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_sessions_user_id'), ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_sessions_user_id'))
+        batch_op.create_unique_constraint('sessions_id_key', ['id'])
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_unique_constraint('users_id_key', ['id'])
@@ -0,0 +1,109 @@
+"""add users email_normalized
+
+Revision ID: e4f27a90c1d3
+Revises: 5b0e3c9d8a14
+Create Date: 2026-10-18 13:05:41.718230
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4f27a90c1d3'
+down_revision = '5b0e3c9d8a14'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Names given to the unnamed constraints reflected by batch operations on SQLite
+naming_convention = {
+    'uq': 'uq_%(table_name)s_%(column_0_name)s',
+}
+
+users = sa.table(
+    'users',
+    sa.column('id', sa.UUID()),
+    sa.column('email', sa.String()),
+    sa.column('email_normalized', sa.String()),
+)
+
+
+def normalize_email(email):
+    # Must match User.normalize_email
+    return email.strip().lower()
+
+
+def user_batches(connection):
+    last_id = None
+    while True:
+        query = sa.select(users.c.id, users.c.email).order_by(users.c.id).limit(BACKFILL_BATCH_SIZE)
+        if last_id is not None:
+            query = query.where(users.c.id > last_id)
+
+        rows = connection.execute(query).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        yield rows
+
+
+def check_duplicates(connection):
+    # Accounts whose emails only differ by case or spaces cannot be merged automatically, so the
+    # migration stops before changing anything and lists them to be resolved by hand.
+    emails = {}
+    for rows in user_batches(connection):
+        for row in rows:
+            emails.setdefault(normalize_email(row.email), []).append(row)
+
+    conflicts = [rows for rows in emails.values() if len(rows) > 1]
+    if conflicts:
+        report = '\n'.join(
+            ', '.join(f'{row.email} ({row.id})' for row in rows) for rows in conflicts
+        )
+        raise RuntimeError(
+            f'{len(conflicts)} emails are used by more than one user once normalized. Change or '
+            f'remove the duplicate accounts and run the migration again:\n{report}'
+        )
+
+
+def unique_email_constraint_names():
+    inspector = sa.inspect(op.get_bind())
+    return [
+        constraint['name'] or naming_convention['uq'] % {'table_name': 'users', 'column_0_name': 'email'}
+        for constraint in inspector.get_unique_constraints('users')
+        if constraint['column_names'] == ['email']
+    ]
+
+
+def upgrade():
+    connection = op.get_bind()
+    check_duplicates(connection)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('email_normalized', sa.String(), nullable=True))
+
+    for rows in user_batches(connection):
+        connection.execute(
+            users.update()
+            .where(users.c.id == sa.bindparam('user_id'))
+            .values(email_normalized=sa.bindparam('normalized')),
+            [{'user_id': row.id, 'normalized': normalize_email(row.email)} for row in rows],
+        )
+
+    # The unique constraint on the normalized email also rejects equal emails, so the one on the
+    # email itself is dropped instead of being maintained on every insert
+    names = unique_email_constraint_names()
+    with op.batch_alter_table('users', schema=None, naming_convention=naming_convention) as batch_op:
+        batch_op.alter_column('email_normalized', existing_type=sa.String(), nullable=False)
+        batch_op.create_unique_constraint('users_email_normalized_key', ['email_normalized'])
+        for name in names:
+            batch_op.drop_constraint(name, type_='unique')
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_constraint('users_email_normalized_key', type_='unique')
+        batch_op.drop_column('email_normalized')
+        batch_op.create_unique_constraint('users_email_key', ['email'])
@@ -0,0 +1,90 @@
+"""
+Fixtures shared by the tests. The application runs against a temporary SQLite database migrated
+with the project's migrations, hashes passwords inline at the lowest bcrypt cost, and every table is
+emptied after each test.
+"""
+
+import os
+import tempfile
+from uuid import uuid4
+
+# The settings are read when config is imported, so they are set before the application is
+# imported
+_database_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_database_dir, 'test.db')}"
+os.environ["PASSWORD_HASHER"] = "bcrypt"
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+os.environ["BCRYPT_LOG_ROUNDS"] = "4"
+
+import pytest  # noqa: E402
+from sqlalchemy import delete, event  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.commands import init_migrations  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models.session import Session  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+_MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "migrations")
+
+
+@pytest.fixture(scope="session")
+def app():
+    from flask_migrate import upgrade
+
+    app = create_app()
+    app.config["TESTING"] = True
+    init_migrations(app)
+
+    with app.app_context():
+        upgrade(directory=_MIGRATIONS_DIR)
+
+    return app
+
+
+@pytest.fixture(autouse=True)
+def app_context(app):
+    with app.app_context():
+        yield
+
+        db.session.rollback()
+        with db.session.begin():
+            db.session.execute(delete(Session))
+            db.session.execute(delete(User))
+
+
+@pytest.fixture
+def make_user():
+    """
+    Insert a user and return its ID. The ID is generated up front, since reading it from the
+    committed user would load the expired row again.
+    """
+
+    def make_user(name="Ana", email="ana@example.com"):
+        user_id = uuid4()
+
+        with db.session.begin():
+            db.session.add(
+                User(id=user_id, name=name, email=email, password_hash="unused")  # type: ignore
+            )
+        return user_id
+
+    return make_user
+
+
+@pytest.fixture
+def statements(app):
+    """
+    Record the SQL statements sent to the database while the test runs, so that tests can assert
+    how many round trips an operation takes.
+    """
+
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
@@ -0,0 +1,32 @@
+"""
+The export commands write to a temporary file and only replace the output once the export
+succeeds, so a failed export never truncates an existing file.
+"""
+
+from app.commands.session_commands import sessions
+from app.commands.user_commands import users
+from config import Config
+
+
+def test_export_replaces_the_output(app, make_user, tmp_path):
+    output = tmp_path / "users.csv"
+    output.write_text("old")
+    make_user()
+
+    result = app.test_cli_runner().invoke(users, ["export", str(output)])
+
+    assert result.exit_code == 0, result.output
+    assert output.read_text().splitlines()[0] == "id,name,email,created_at"
+    assert [path.name for path in tmp_path.iterdir()] == ["users.csv"]
+
+
+def test_failed_export_keeps_the_output(app, monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "SESSION_STORE", "memory")
+    output = tmp_path / "sessions.csv"
+    output.write_text("old")
+
+    result = app.test_cli_runner().invoke(sessions, ["export", str(output)])
+
+    assert result.exit_code != 0
+    assert output.read_text() == "old"
+    assert [path.name for path in tmp_path.iterdir()] == ["sessions.csv"]
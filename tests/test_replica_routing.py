@@ -0,0 +1,80 @@
+"""
+Routing of queries between the primary and a read replica. The application runs against two
+temporary SQLite files holding the same user under different names, so the name that is read
+tells which database answered.
+"""
+
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import insert, select
+
+from app import create_app
+from app.database import replica_engines, replica_reads
+from app.extensions import db
+from app.models.user import User
+from config import Config
+
+
+@pytest.fixture
+def user_id(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'primary.db'}")
+    monkeypatch.setattr(Config, "DATABASE_REPLICA_URLS", [f"sqlite:///{tmp_path / 'replica.db'}"])
+    app = create_app()
+    user_id = uuid4()
+
+    with app.app_context():
+        for engine, name in ((db.engine, "Primary"), (replica_engines(db)[0], "Replica")):
+            db.metadata.create_all(engine, tables=[User.__table__])
+
+            with engine.begin() as connection:
+                connection.execute(
+                    insert(User).values(
+                        id=user_id,
+                        name=name,
+                        email="ana@example.com",
+                        email_normalized="ana@example.com",
+                        password_hash="unused",
+                    )
+                )
+
+        yield user_id
+
+        db.session.remove()
+
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def _read_name(user_id, **options):
+    return db.session.scalars(select(User.name).where(User.id == user_id), **options).one()
+
+
+def test_reads_go_to_the_primary_by_default(user_id):
+    with db.session.begin():
+        assert _read_name(user_id) == "Primary"
+
+
+def test_reads_go_to_the_replica_inside_replica_reads(user_id):
+    with replica_reads(), db.session.begin():
+        assert _read_name(user_id) == "Replica"
+
+
+def test_locking_reads_go_to_the_primary(user_id):
+    with replica_reads(), db.session.begin():
+        statement = select(User.name).where(User.id == user_id).with_for_update()
+        assert db.session.scalars(statement).one() == "Primary"
+
+
+def test_writes_go_to_the_primary_and_later_reads_follow(user_id):
+    with replica_reads(), db.session.begin():
+        user = db.session.scalars(select(User).where(User.id == user_id)).one()
+        assert user.name == "Replica"
+
+        user.name = "Renamed"
+        db.session.flush()
+
+        assert _read_name(user_id) == "Renamed"
+
+    with db.session.begin():
+        assert _read_name(user_id) == "Renamed"
@@ -0,0 +1,82 @@
+"""
+Query counts of the session operations on the SQL session store. Each operation reads the user
+information along with the session, so it must never take more than one statement.
+"""
+
+import pytest
+
+from app.exceptions import SessionNotFoundException
+from app.services import session_service
+
+
+def _create_session(make_user):
+    user_id = make_user()
+    return session_service.create_session(user_id, "Ana", "ana@example.com")
+
+
+def test_refresh_session_is_a_single_update_returning_the_user(make_user, statements):
+    session = _create_session(make_user)
+    statements.clear()
+
+    access_token, refresh_token = session_service.refresh_session(session.refresh_token)
+
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("UPDATE")
+    assert "RETURNING" in statements[0].upper()
+    user = session_service.decode_jwt(access_token)["data"]
+    assert (user["name"], user["email"]) == ("Ana", "ana@example.com")
+    assert refresh_token != session.refresh_token
+
+
+def test_refresh_within_the_grace_period_only_checks_the_session(make_user, statements):
+    session = _create_session(make_user)
+    new_tokens = session_service.refresh_session(session.refresh_token)
+    statements.clear()
+
+    assert session_service.refresh_session(session.refresh_token) == new_tokens
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("SELECT")
+
+
+def test_logout_ends_the_grace_period(make_user):
+    session = _create_session(make_user)
+    session_service.refresh_session(session.refresh_token)
+
+    session_service.delete_session_by_id(session.id)
+
+    with pytest.raises(SessionNotFoundException):
+        session_service.refresh_session(session.refresh_token)
+
+
+def test_revoking_the_user_sessions_ends_the_grace_period(make_user):
+    session = _create_session(make_user)
+    session_service.refresh_session(session.refresh_token)
+
+    session_service.delete_user_sessions(session.user_id)
+
+    with pytest.raises(SessionNotFoundException):
+        session_service.refresh_session(session.refresh_token)
+
+
+def test_session_lookups_are_a_single_select(make_user, statements):
+    session = _create_session(make_user)
+    statements.clear()
+
+    found = session_service.get_session_by_id(session.id)
+    assert len(statements) == 1
+    assert (found.name, found.email) == ("Ana", "ana@example.com")
+
+    statements.clear()
+    found = session_service.get_session_by_refresh_token(session.refresh_token)
+    assert len(statements) == 1
+    assert (found.name, found.email) == ("Ana", "ana@example.com")
+
+
+def test_create_session_is_a_single_insert(make_user, statements):
+    user_id = make_user()
+    statements.clear()
+
+    session_service.create_session(user_id, "Ana", "ana@example.com")
+
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("INSERT")
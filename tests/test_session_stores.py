@@ -0,0 +1,145 @@
+"""
+Conformance cases of the SessionStore interface. Every case runs against every backend, so the
+backends can be swapped with the SESSION_STORE setting without changing the behavior of the
+sessions.
+"""
+
+from datetime import timezone
+
+import pytest
+from sqlalchemy import update
+
+from app.extensions import db
+from app.models.user import User
+from app.stores import create_session_store
+from config import Config
+
+
+@pytest.fixture(params=["sql", "memory"])
+def store(request):
+    return create_session_store(request.param)
+
+
+@pytest.fixture
+def expired(monkeypatch):
+    # Sessions created while this fixture is active are already expired
+    monkeypatch.setattr(Config, "SESSION_EXPIRATION_SECS", -60)
+
+
+def _utc(moment):
+    # SQLite returns naive datetimes, which are in UTC
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def _rename_user(store, user_id, name, email):
+    # Like user_service, the users table is updated first and the store is told afterwards
+    with db.session.begin():
+        db.session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(name=name, email=email, email_normalized=User.normalize_email(email))
+        )
+    store.update_user(user_id, name, email)
+
+
+def test_create_returns_the_session_with_its_refresh_token(store, make_user):
+    user_id = make_user()
+
+    session = store.create(user_id, "Ana", "ana@example.com")
+
+    assert session.user_id == user_id
+    assert (session.name, session.email) == ("Ana", "ana@example.com")
+    assert session.refresh_token
+
+
+def test_lookups_return_the_session_without_its_refresh_token(store, make_user):
+    user_id = make_user()
+    session = store.create(user_id, "Ana", "ana@example.com")
+
+    by_id = store.get_by_id(session.id)
+    by_refresh_token = store.get_by_refresh_token(session.refresh_token)
+
+    for found in (by_id, by_refresh_token):
+        assert found.id == session.id
+        assert found.user_id == user_id
+        assert (found.name, found.email) == ("Ana", "ana@example.com")
+        assert found.refresh_token is None
+
+
+def test_lookups_of_unknown_sessions_return_none(store, make_user):
+    user_id = make_user()
+    session = store.create(user_id, "Ana", "ana@example.com")
+
+    assert store.get_by_id(user_id) is None
+    assert store.get_by_refresh_token(session.refresh_token + "x") is None
+
+
+def test_rotate_replaces_the_refresh_token(store, make_user):
+    user_id = make_user()
+    session = store.create(user_id, "Ana", "ana@example.com")
+
+    rotated = store.rotate(session.refresh_token)
+
+    assert rotated.id == session.id
+    assert rotated.refresh_token not in (None, session.refresh_token)
+    assert _utc(rotated.expires_at) >= _utc(session.expires_at)
+    assert store.get_by_refresh_token(session.refresh_token) is None
+    assert store.get_by_refresh_token(rotated.refresh_token).id == session.id
+    assert store.rotate(session.refresh_token) is None
+
+
+def test_delete_removes_the_session_once(store, make_user):
+    user_id = make_user()
+    session = store.create(user_id, "Ana", "ana@example.com")
+
+    assert store.delete(session.id) is True
+    assert store.delete(session.id) is False
+    assert store.get_by_id(session.id) is None
+    assert store.get_by_refresh_token(session.refresh_token) is None
+
+
+def test_expired_sessions_are_never_returned(store, make_user, expired):
+    user_id = make_user()
+    session = store.create(user_id, "Ana", "ana@example.com")
+
+    assert store.get_by_id(session.id) is None
+    assert store.get_by_refresh_token(session.refresh_token) is None
+    assert store.rotate(session.refresh_token) is None
+    assert store.delete(session.id) is False
+
+
+def test_delete_expired_deletes_in_batches(store, make_user, monkeypatch):
+    user_id = make_user()
+    valid = store.create(user_id, "Ana", "ana@example.com")
+    monkeypatch.setattr(Config, "SESSION_EXPIRATION_SECS", -60)
+    for _ in range(3):
+        store.create(user_id, "Ana", "ana@example.com")
+
+    assert store.delete_expired(2) == 2
+    assert store.delete_expired(2) == 1
+    assert store.delete_expired(2) == 0
+    assert store.get_by_id(valid.id) is not None
+
+
+def test_update_user_changes_the_user_information_of_the_sessions(store, make_user):
+    user_id = make_user()
+    session = store.create(user_id, "Ana", "ana@example.com")
+
+    _rename_user(store, user_id, "Ana B", "ana.b@example.com")
+
+    found = store.get_by_id(session.id)
+    assert (found.name, found.email) == ("Ana B", "ana.b@example.com")
+    rotated = store.rotate(session.refresh_token)
+    assert (rotated.name, rotated.email) == ("Ana B", "ana.b@example.com")
+
+
+def test_delete_user_sessions_only_deletes_that_user_sessions(store, make_user):
+    user_id = make_user()
+    other_user_id = make_user("Bia", "bia@example.com")
+    sessions = [store.create(user_id, "Ana", "ana@example.com") for _ in range(2)]
+    other_session = store.create(other_user_id, "Bia", "bia@example.com")
+
+    assert store.delete_user_sessions(user_id) == 2
+    assert all(store.get_by_id(session.id) is None for session in sessions)
+    assert store.get_by_id(other_session.id) is not None
+    assert store.delete_user_sessions(user_id) == 0
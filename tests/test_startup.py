@@ -0,0 +1,35 @@
+"""
+Startup time budget. The application is started in a new interpreter, like a WSGI server does, and
+must be ready within the budget. The budget can be raised on slow machines with the
+STARTUP_BUDGET_MS environment variable.
+"""
+
+import os
+
+from app.commands.startup_commands import startup_profile
+
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", 1500))
+
+
+def test_startup_is_within_the_budget(app):
+    result = app.test_cli_runner().invoke(
+        startup_profile, ["--runs", "3", "--budget-ms", str(STARTUP_BUDGET_MS)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "create_app phases" in result.output
+
+
+def test_startup_over_the_budget_fails(app):
+    result = app.test_cli_runner().invoke(startup_profile, ["--runs", "1", "--budget-ms", "0"])
+
+    assert result.exit_code != 0
+    assert "over the budget" in result.output
+
+
+def test_migration_tooling_is_not_loaded_by_a_wsgi_server(app):
+    result = app.test_cli_runner().invoke(startup_profile, ["--runs", "1", "--top", "1000"])
+
+    assert result.exit_code == 0, result.output
+    for package in ("alembic", "flask_migrate"):
+        assert f"  {package} " not in result.output
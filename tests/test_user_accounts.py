@@ -0,0 +1,71 @@
+"""
+Account changes that also touch the sessions of the user. The sessions are only changed once the
+change of the user is committed, so a failed change never leaves them out of sync with the user.
+"""
+
+import pytest
+from flask import g
+from sqlalchemy import update
+
+from app import stores
+from app.exceptions import ConcurrentModificationException
+from app.extensions import db
+from app.models.user import User
+from app.services import user_service
+
+PASSWORD = "Abcdef1!"
+
+
+@pytest.fixture(params=["sql", "memory"])
+def store(request, monkeypatch):
+    store = stores.create_session_store(request.param)
+    monkeypatch.setattr(stores, "_session_store", store)
+    return store
+
+
+def _register():
+    user_service.create_user("Ana", "ana@example.com", PASSWORD)
+    user_id = user_service.get_user_by_email("ana@example.com").id
+    # Like a new request, the services start without an open transaction
+    db.session.rollback()
+    return user_id
+
+
+def _modify_concurrently(user_id):
+    # Another request updates the user between the read and the commit of the current request
+    with db.engine.begin() as connection:
+        connection.execute(
+            update(User).where(User.id == user_id).values(version=User.version + 1)
+        )
+
+
+def test_delete_current_user_revokes_the_sessions(app, store):
+    user_id = _register()
+    session = store.create(user_id, "Ana", "ana@example.com")
+
+    with app.test_request_context():
+        g.user_id, g.name, g.email = user_id, "Ana", "ana@example.com"
+        user_service.delete_current_user(PASSWORD)
+
+    assert store.get_by_id(session.id) is None
+    assert db.session.get(User, user_id) is None
+
+
+def test_failed_deletion_keeps_the_sessions(app, store, monkeypatch):
+    user_id = _register()
+    session = store.create(user_id, "Ana", "ana@example.com")
+    check_password = user_service.check_password
+
+    def check_password_then_modify(password, password_hash):
+        _modify_concurrently(user_id)
+        return check_password(password, password_hash)
+
+    monkeypatch.setattr(user_service, "check_password", check_password_then_modify)
+
+    with app.test_request_context():
+        g.user_id, g.name, g.email = user_id, "Ana", "ana@example.com"
+        with pytest.raises(ConcurrentModificationException):
+            user_service.delete_current_user(PASSWORD)
+
+    assert store.get_by_id(session.id) is not None
+    assert db.session.get(User, user_id) is not None
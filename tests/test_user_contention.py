@@ -0,0 +1,64 @@
+"""
+Contention on a single account. Concurrent logins, refreshes and updates of the same user never
+take row locks: they either succeed or fail with a 409 when an update lost the race, and the
+version of the user row counts exactly the updates that succeeded.
+"""
+
+import os
+import threading
+
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models.user import User
+from config import Config
+
+THREADS = int(os.getenv("CONTENTION_THREADS", 8))
+PASSWORD = "Senha@123"
+
+
+def test_concurrent_logins_refreshes_and_updates(app, monkeypatch):
+    monkeypatch.setattr(Config, "RATE_LIMIT_LOGIN_PER_IP", THREADS * 2)
+    monkeypatch.setattr(Config, "RATE_LIMIT_LOGIN_PER_EMAIL", THREADS * 2)
+    client = app.test_client()
+    credentials = {"email": "contention@example.com", "password": PASSWORD}
+    assert client.post("/api/auth/register", json={"name": "Ana", **credentials}).status_code == 201
+    assert client.post("/api/auth/login", json=credentials).status_code == 200
+    refresh_token = client.get_cookie("refresh_token").value
+
+    barrier = threading.Barrier(THREADS)
+    statuses = []
+    renamed = []
+
+    def worker(number):
+        own = app.test_client()
+        shared = app.test_client()
+        shared.set_cookie("refresh_token", refresh_token)
+        barrier.wait()
+
+        login = own.post("/api/auth/login", json=credentials).status_code
+        refresh = shared.get("/api/my-account").status_code
+        name = f"Ana {number}"
+        update = own.put("/api/my-account/name", json={"name": name}).status_code
+        statuses.extend((login, refresh, update))
+
+        if update == 200:
+            renamed.append(name)
+
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(THREADS)]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(statuses) == THREADS * 3
+    assert set(statuses) <= {200, 409}, statuses
+    assert renamed
+
+    with db.session.begin():
+        user = db.session.scalars(
+            select(User).where(User.email == credentials["email"])
+        ).one()
+        assert user.version == 1 + len(renamed)
+        assert user.name in renamed
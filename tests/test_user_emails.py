@@ -0,0 +1,73 @@
+"""
+Uniqueness of the user emails. Users are created and their emails updated in a single statement,
+so the unique index on the normalized email is what rejects duplicates, even under concurrency.
+"""
+
+import threading
+
+import pytest
+from flask import g
+from sqlalchemy import func, select
+
+from app.exceptions import EmailAlreadyInUseException
+from app.extensions import db
+from app.models.user import User
+from app.services import user_service
+
+PASSWORD = "Abcdef1!"
+
+
+def test_concurrent_registrations_with_the_same_email_create_one_user(app):
+    attempts = 8
+    barrier = threading.Barrier(attempts)
+    outcomes = []
+    outcomes_lock = threading.Lock()
+
+    def register(index):
+        with app.app_context():
+            barrier.wait()
+            try:
+                # The case differs between attempts, which must not defeat the unique index
+                email = "ana@example.com" if index % 2 else "ANA@example.com"
+                user_service.create_user(f"Ana {index}", email, PASSWORD)
+                outcome = "created"
+            except EmailAlreadyInUseException:
+                outcome = "rejected"
+
+        with outcomes_lock:
+            outcomes.append(outcome)
+
+    threads = [threading.Thread(target=register, args=(index,)) for index in range(attempts)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(outcomes) == ["created"] + ["rejected"] * (attempts - 1)
+    assert db.session.scalar(select(func.count()).select_from(User)) == 1
+
+
+def test_create_user_rejects_an_email_in_use(statements):
+    user_service.create_user("Ana", "ana@example.com", PASSWORD)
+    statements.clear()
+
+    with pytest.raises(EmailAlreadyInUseException):
+        user_service.create_user("Ana", " Ana@Example.com ", PASSWORD)
+
+    # The duplicate is detected by the INSERT itself, without a SELECT before it
+    assert [statement.split()[0].upper() for statement in statements] == ["INSERT"]
+
+
+def test_update_current_user_email_rejects_an_email_in_use(app, make_user):
+    make_user("Bia", "bia@example.com")
+    user_id = make_user("Ana", "ana@example.com")
+
+    with app.test_request_context():
+        g.user_id, g.name, g.email = user_id, "Ana", "ana@example.com"
+
+        with pytest.raises(EmailAlreadyInUseException):
+            user_service.update_current_user_email("BIA@example.com")
+
+        user_service.update_current_user_email("ana.b@example.com")
+
+    assert db.session.get(User, user_id).email == "ana.b@example.com"